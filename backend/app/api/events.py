@@ -30,6 +30,159 @@ logger = get_logger(__name__)
 router = APIRouter(tags=["Events"])
 
 
+async def _process_event(event: EventCreate) -> EventResponse:
+    """
+    Run a single event through the full logging pipeline.
+
+    Shared by the single and batch endpoints so batched events update
+    features, the online learning buffer and drift tracking exactly as
+    individually posted events do.
+
+    Args:
+        event: Event data to log
+
+    Returns:
+        EventResponse with logged event details
+    """
+    # Generate event ID
+    event_id = f"evt_{uuid.uuid4().hex[:12]}"
+
+    # Set timestamp if not provided
+    timestamp = event.timestamp or datetime.utcnow()
+
+    # Log the event
+    logger.info(
+        "event_logged",
+        event_id=event_id,
+        user_id=event.user_id,
+        item_id=event.item_id,
+        event_type=event.event_type.value,
+    )
+
+    # Record metrics
+    monitoring_service = get_monitoring_service()
+    monitoring_service.record_event(event.event_type.value)
+
+    # 🧠 DYNAMIC INTEREST UPDATE: nudge user's genre interest vector
+    # based on the genres of the interacted item and the event strength.
+    try:
+        from ..services.user_profile import get_user_profile_service
+        from ..services.movie_catalog import get_item_metadata
+
+        profile_svc = get_user_profile_service()
+        if profile_svc and profile_svc.has_profile(event.user_id):
+            item_meta = get_item_metadata(event.item_id)
+            genres = item_meta.get("genres", [])
+
+            # Map event → strength delta (positive = boost, negative = suppress)
+            evt = event.event_type.value
+            if evt == "view":
+                delta = 0.04
+            elif evt in ("click", "share"):
+                delta = 0.07
+            elif evt == "like":
+                delta = 0.12
+            elif evt == "dislike":
+                delta = -0.12
+            elif evt == "rating" and event.value is not None:
+                # rating 1-5: map to [-0.15, +0.15]
+                delta = (event.value - 3.0) / 2.0 * 0.15
+            else:
+                delta = 0.0
+
+            # Genre names in catalog use Title Case; our interest categories are lower
+            GENRE_MAP = {
+                "action": "action", "adventure": "action",
+                "comedy": "comedy",
+                "drama": "drama",
+                "romance": "romance",
+                "thriller": "thriller", "crime": "thriller", "film-noir": "thriller",
+                "sci-fi": "sci_fi", "fantasy": "sci_fi",
+                "horror": "horror",
+                "documentary": "documentary", "war": "documentary",
+                "musical": "comedy", "animation": "comedy", "children's": "comedy",
+                "mystery": "thriller", "western": "action",
+            }
+
+            updated_cats = set()
+            profile = profile_svc.get_profile(event.user_id)
+            if profile and delta != 0.0:
+                for genre in genres:
+                    cat = GENRE_MAP.get(genre.lower())
+                    if cat and cat not in updated_cats:
+                        old_w = profile["interests"].get(cat, 0.5)
+                        new_w = max(0.0, min(1.0, old_w + delta))
+                        profile_svc.update_user_interest(event.user_id, cat, new_w)
+                        updated_cats.add(cat)
+
+            if updated_cats:
+                logger.info(
+                    "interest_profile_updated_from_event",
+                    user_id=event.user_id,
+                    item_id=event.item_id,
+                    event_type=evt,
+                    delta=round(delta, 3),
+                    categories_updated=list(updated_cats),
+                )
+    except Exception as e:
+        logger.warning("interest_profile_update_failed", error=str(e))
+        # Never block the event response
+
+    # 🔥 DYNAMIC BEHAVIOR: Update user features in real-time
+    try:
+        feature_store_service = get_feature_store_service()
+        await feature_store_service.update_user_features_from_event(
+            user_id=event.user_id,
+            item_id=event.item_id,
+            event_type=event.event_type.value,
+            timestamp=timestamp,
+            value=event.value
+        )
+        logger.info(
+            "user_features_updated",
+            user_id=event.user_id,
+            item_id=event.item_id,
+            event_type=event.event_type.value
+        )
+    except Exception as e:
+        logger.warning("feature_update_failed", error=str(e))
+        # Continue even if feature update fails
+    
+    # 🔥 ONLINE LEARNING: Add interaction to learning buffer
+    try:
+        online_learning_service = get_online_learning_service()
+        await online_learning_service.add_interaction(
+            user_id=event.user_id,
+            item_id=event.item_id,
+            event_type=event.event_type.value,
+            timestamp=timestamp,
+        )
+        logger.debug("interaction_added_to_learning_buffer")
+    except Exception as e:
+        logger.warning("online_learning_update_failed", error=str(e))
+    
+    # 🔥 DRIFT DETECTION: Record for auto-retraining triggers
+    try:
+        auto_retrain_service = get_auto_retrain_service()
+        await auto_retrain_service.record_interaction_for_drift(
+            features={
+                "event_type": hash(event.event_type.value) % 100,
+                "timestamp_hour": timestamp.hour,
+            }
+        )
+    except Exception as e:
+        logger.warning("drift_tracking_failed", error=str(e))
+
+    return EventResponse(
+        event_id=event_id,
+        user_id=event.user_id,
+        item_id=event.item_id,
+        event_type=event.event_type,
+        timestamp=timestamp,
+        status="logged",
+    )
+
+
 @router.post(
     "/event",
     response_model=EventResponse,
@@ -70,143 +223,7 @@ async def log_event(event: EventCreate) -> EventResponse:
         HTTPException: If event logging fails
     """
     try:
-        # Generate event ID
-        event_id = f"evt_{uuid.uuid4().hex[:12]}"
-
-        # Set timestamp if not provided
-        timestamp = event.timestamp or datetime.utcnow()
-
-        # Log the event
-        logger.info(
-            "event_logged",
-            event_id=event_id,
-            user_id=event.user_id,
-            item_id=event.item_id,
-            event_type=event.event_type.value,
-        )
-
-        # Record metrics
-        monitoring_service = get_monitoring_service()
-        monitoring_service.record_event(event.event_type.value)
-
-        # 🧠 DYNAMIC INTEREST UPDATE: nudge user's genre interest vector
-        # based on the genres of the interacted item and the event strength.
-        try:
-            from ..services.user_profile import get_user_profile_service
-            from ..services.movie_catalog import get_item_metadata
-
-            profile_svc = get_user_profile_service()
-            if profile_svc and profile_svc.has_profile(event.user_id):
-                item_meta = get_item_metadata(event.item_id)
-                genres = item_meta.get("genres", [])
-
-                # Map event → strength delta (positive = boost, negative = suppress)
-                evt = event.event_type.value
-                if evt == "view":
-                    delta = 0.04
-                elif evt in ("click", "share"):
-                    delta = 0.07
-                elif evt == "like":
-                    delta = 0.12
-                elif evt == "dislike":
-                    delta = -0.12
-                elif evt == "rating" and event.value is not None:
-                    # rating 1-5: map to [-0.15, +0.15]
-                    delta = (event.value - 3.0) / 2.0 * 0.15
-                else:
-                    delta = 0.0
-
-                # Genre names in catalog use Title Case; our interest categories are lower
-                GENRE_MAP = {
-                    "action": "action", "adventure": "action",
-                    "comedy": "comedy",
-                    "drama": "drama",
-                    "romance": "romance",
-                    "thriller": "thriller", "crime": "thriller", "film-noir": "thriller",
-                    "sci-fi": "sci_fi", "fantasy": "sci_fi",
-                    "horror": "horror",
-                    "documentary": "documentary", "war": "documentary",
-                    "musical": "comedy", "animation": "comedy", "children's": "comedy",
-                    "mystery": "thriller", "western": "action",
-                }
-
-                updated_cats = set()
-                profile = profile_svc.get_profile(event.user_id)
-                if profile and delta != 0.0:
-                    for genre in genres:
-                        cat = GENRE_MAP.get(genre.lower())
-                        if cat and cat not in updated_cats:
-                            old_w = profile["interests"].get(cat, 0.5)
-                            new_w = max(0.0, min(1.0, old_w + delta))
-                            profile_svc.update_user_interest(event.user_id, cat, new_w)
-                            updated_cats.add(cat)
-
-                if updated_cats:
-                    logger.info(
-                        "interest_profile_updated_from_event",
-                        user_id=event.user_id,
-                        item_id=event.item_id,
-                        event_type=evt,
-                        delta=round(delta, 3),
-                        categories_updated=list(updated_cats),
-                    )
-        except Exception as e:
-            logger.warning("interest_profile_update_failed", error=str(e))
-            # Never block the event response
-
-        # 🔥 DYNAMIC BEHAVIOR: Update user features in real-time
-        try:
-            feature_store_service = get_feature_store_service()
-            await feature_store_service.update_user_features_from_event(
-                user_id=event.user_id,
-                item_id=event.item_id,
-                event_type=event.event_type.value,
-                timestamp=timestamp,
-                value=event.value
-            )
-            logger.info(
-                "user_features_updated",
-                user_id=event.user_id,
-                item_id=event.item_id,
-                event_type=event.event_type.value
-            )
-        except Exception as e:
-            logger.warning("feature_update_failed", error=str(e))
-            # Continue even if feature update fails
-        
-        # 🔥 ONLINE LEARNING: Add interaction to learning buffer
-        try:
-            online_learning_service = get_online_learning_service()
-            await online_learning_service.add_interaction(
-                user_id=event.user_id,
-                item_id=event.item_id,
-                event_type=event.event_type.value,
-                timestamp=timestamp,
-            )
-            logger.debug("interaction_added_to_learning_buffer")
-        except Exception as e:
-            logger.warning("online_learning_update_failed", error=str(e))
-        
-        # 🔥 DRIFT DETECTION: Record for auto-retraining triggers
-        try:
-            auto_retrain_service = get_auto_retrain_service()
-            await auto_retrain_service.record_interaction_for_drift(
-                features={
-                    "event_type": hash(event.event_type.value) % 100,
-                    "timestamp_hour": timestamp.hour,
-                }
-            )
-        except Exception as e:
-            logger.warning("drift_tracking_failed", error=str(e))
-
-        return EventResponse(
-            event_id=event_id,
-            user_id=event.user_id,
-            item_id=event.item_id,
-            event_type=event.event_type,
-            timestamp=timestamp,
-            status="logged",
-        )
+        return await _process_event(event)
 
     except Exception as e:
         logger.error("event_logging_failed", error=str(e))
@@ -235,8 +252,11 @@ async def log_event(event: EventCreate) -> EventResponse:
     - Event replay from offline sources
     - Periodic batch logging of collected events
 
+    Each event goes through the same pipeline as POST /event (feature
+    updates, online learning buffer, drift tracking), so a batch replaces
+    N round trips with one.
+
     Performance:
-    - Events are processed in parallel
     - Batch size is limited to 1000 events per request
     """,
 )
@@ -264,27 +284,7 @@ async def log_events_batch(events: List[EventCreate]) -> List[EventResponse]:
         )
 
     try:
-        responses = []
-        monitoring_service = get_monitoring_service()
-
-        for event in events:
-            # Generate event ID
-            event_id = f"evt_{uuid.uuid4().hex[:12]}"
-            timestamp = event.timestamp or datetime.utcnow()
-
-            responses.append(
-                EventResponse(
-                    event_id=event_id,
-                    user_id=event.user_id,
-                    item_id=event.item_id,
-                    event_type=event.event_type,
-                    timestamp=timestamp,
-                    status="logged",
-                )
-            )
-
-            # Record metrics
-            monitoring_service.record_event(event.event_type.value)
+        responses = [await _process_event(event) for event in events]
 
         # Log batch completion
         logger.info(
@@ -3,7 +3,7 @@
 API endpoints for system metrics and monitoring data.
 
 These endpoints provide:
-- GET /metrics: Get current system metrics
+- GET /metrics: Get current system metrics (optionally projected via ?fields=)
 - GET /metrics/drift: Get drift detection results
 - GET /metrics/prometheus: Prometheus-compatible metrics endpoint
 
@@ -15,10 +15,10 @@ Metrics are essential for:
 """
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Response
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from ..core.logging import get_logger
 from ..models.schemas import (
@@ -34,6 +34,111 @@ logger = get_logger(__name__)
 router = APIRouter(tags=["Metrics"])
 
 
+# Projectable sections and their keys, with the safe values returned when a
+# section cannot be computed (mirrors the full endpoint's error defaults)
+_PROJECTION_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "prediction_metrics": {
+        "total_predictions": 0,
+        "predictions_last_hour": 0,
+        "average_latency_ms": 0,
+        "p95_latency_ms": 0,
+        "p99_latency_ms": 0,
+        "cache_hit_rate": 0,
+        "cold_start_rate": 0,
+    },
+    "drift_metrics": {
+        "feature_drift_score": 0,
+        "prediction_drift_score": 0,
+        "drifted_features": [],
+        "status": "unknown",
+        "last_checked": None,
+    },
+    "system_metrics": {
+        "cpu_usage_percent": 0,
+        "memory_usage_percent": 0,
+        "memory_usage_mb": 0,
+        "request_queue_size": 0,
+    },
+}
+
+
+def _parse_fields(fields: str) -> List[Tuple[str, str]]:
+    """
+    Split a projection into (section, key) pairs, rejecting unknown paths.
+
+    Args:
+        fields: Comma-separated dotted paths, e.g. "prediction_metrics.total_predictions"
+
+    Returns:
+        List of (section, key) pairs; key is empty for a whole section
+
+    Raises:
+        HTTPException: 400 if a section or key is not part of the payload
+    """
+    paths = []
+    unknown = []
+    for path in filter(None, (field.strip() for field in fields.split(","))):
+        section, _, key = path.partition(".")
+        if section not in _PROJECTION_DEFAULTS or (
+            key and key not in _PROJECTION_DEFAULTS[section]
+        ):
+            unknown.append(path)
+        else:
+            paths.append((section, key))
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error_type": "InvalidFields",
+                "message": f"Unknown metrics fields: {', '.join(unknown)}",
+            },
+        )
+    return paths
+
+
+def _project_metrics(paths: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Build only the requested slices of the metrics payload.
+
+    Sections that are not requested are never computed, so a caller polling
+    a single counter skips drift checks and system resource sampling. A
+    section that fails to compute falls back to its zeroed defaults.
+
+    Args:
+        paths: Validated (section, key) pairs from _parse_fields
+
+    Returns:
+        Nested dictionary containing just the requested values
+    """
+    monitoring_service = get_monitoring_service()
+    sections = {
+        "prediction_metrics": monitoring_service.get_prediction_metrics,
+        "drift_metrics": monitoring_service.get_drift_metrics,
+        "system_metrics": monitoring_service.get_system_metrics,
+    }
+
+    computed: Dict[str, Dict[str, Any]] = {}
+    result: Dict[str, Any] = {}
+    for section, key in paths:
+        if section not in computed:
+            try:
+                computed[section] = {
+                    **_PROJECTION_DEFAULTS[section],
+                    **sections[section](),
+                }
+            except Exception as e:
+                logger.error("metrics_projection_failed", section=section, error=str(e))
+                computed[section] = dict(_PROJECTION_DEFAULTS[section])
+
+        if not key:
+            result[section] = computed[section]
+        else:
+            result.setdefault(section, {})[key] = computed[section][key]
+
+    return result
+
+
 @router.get(
     "/metrics",
     response_model=MetricsResponse,
@@ -52,15 +157,33 @@ router = APIRouter(tags=["Metrics"])
     - Alerting thresholds
     - Performance analysis
     - Capacity planning
+
+    Pass `fields` (comma-separated dotted paths such as
+    `prediction_metrics.total_predictions`) to receive only those values.
     """,
 )
-async def get_metrics() -> MetricsResponse:
+async def get_metrics(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated dotted paths to return instead of the full payload",
+    ),
+) -> Union[MetricsResponse, JSONResponse]:
     """
     Get all system metrics.
 
+    Args:
+        fields: Optional projection of the payload
+
     Returns:
-        MetricsResponse with comprehensive metrics
+        MetricsResponse with comprehensive metrics, or only the requested
+        fields when a projection is given
+
+    Raises:
+        HTTPException: 400 if the projection names an unknown field
     """
+    if fields:
+        return JSONResponse(content=_project_metrics(_parse_fields(fields)))
+
     try:
         monitoring_service = get_monitoring_service()
         feature_store_service = get_feature_store_service()
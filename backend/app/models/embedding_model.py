@@ -83,6 +83,10 @@ class MatrixFactorizationModel:
             factors=embedding_dim,
             regularization=regularization,
             alpha=alpha,
+            dtype=np.float32,
+            use_native=True,  # Cython/OpenMP solver
+            use_cg=True,  # Conjugate-gradient updates instead of exact solves
+            num_threads=0,  # One OpenMP thread per core
             iterations=iterations,
             random_state=random_state,
             use_gpu=False  # Set to True if GPU available
@@ -109,41 +113,41 @@ class MatrixFactorizationModel:
         Train the model on interaction data.
         
         Args:
-            user_ids: List of user identifiers
-            item_ids: List of item identifiers  
-            values: List of interaction strengths (ratings, clicks, etc.)
+            user_ids: User identifiers (list or array; integer ids are
+                keyed by their str form)
+            item_ids: Item identifiers (list or array)
+            values: Interaction strengths (ratings, clicks, etc.)
             n_users: Total number of users (for sparse matrix)
             n_items: Total number of items (for sparse matrix)
         """
         logger.info(f"Training ALS model with {len(user_ids)} interactions...")
         
-        # Create ID mappings
-        unique_users = sorted(set(user_ids))
-        unique_items = sorted(set(item_ids))
+        # Create ID mappings and matrix indices in one vectorized pass
+        unique_users, user_indices = self._encode_ids(user_ids)
+        unique_items, item_indices = self._encode_ids(item_ids)
         
         self.user_id_map = {uid: idx for idx, uid in enumerate(unique_users)}
         self.item_id_map = {iid: idx for idx, iid in enumerate(unique_items)}
-        self.reverse_user_map = {idx: uid for uid, idx in self.user_id_map.items()}
-        self.reverse_item_map = {idx: iid for iid, idx in self.item_id_map.items()}
-        
-        # Convert to matrix indices
-        user_indices = [self.user_id_map[uid] for uid in user_ids]
-        item_indices = [self.item_id_map[iid] for iid in item_ids]
+        self.reverse_user_map = dict(enumerate(unique_users))
+        self.reverse_item_map = dict(enumerate(unique_items))
         
         # Create sparse interaction matrix
         n_users = n_users or len(unique_users)
         n_items = n_items or len(unique_items)
         
+        # float32 CSR is what implicit's solver consumes; building it in
+        # that dtype avoids a converted copy inside fit()
         interaction_matrix = csr_matrix(
-            (values, (user_indices, item_indices)),
-            shape=(n_users, n_items)
+            (np.asarray(values, dtype=np.float32), (user_indices, item_indices)),
+            shape=(n_users, n_items),
+            dtype=np.float32
         )
         
         logger.info(f"Interaction matrix shape: {interaction_matrix.shape}")
         logger.info(f"Sparsity: {1 - interaction_matrix.nnz / (n_users * n_items):.4f}")
         
         # Train model
-        self.model.fit(interaction_matrix)
+        self.model.fit(interaction_matrix, show_progress=False)
         
         # Extract embeddings
         self.user_embeddings = self.model.user_factors
@@ -154,6 +158,25 @@ class MatrixFactorizationModel:
         logger.info(f"✅ Training complete. User embeddings: {self.user_embeddings.shape}, "
                    f"Item embeddings: {self.item_embeddings.shape}")
     
+    @staticmethod
+    def _encode_ids(ids) -> Tuple[List[str], np.ndarray]:
+        """
+        Sorted distinct str ids and each input's index into them.
+
+        Distinct values are found on the raw (e.g. int32) array and only
+        those are converted to str, then ranked in str order so indices
+        match sorting the str ids directly.
+        """
+        ids = np.asarray(ids)
+        if ids.dtype == object:
+            ids = ids.astype(str)
+        uniques, inverse = np.unique(ids, return_inverse=True)
+        labels = uniques.astype(str)
+        order = np.argsort(labels, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return labels[order].tolist(), rank[inverse.ravel()]
+
     def get_user_embedding(self, user_id: str) -> Optional[np.ndarray]:
         """
         Get embedding for a user.
@@ -184,13 +207,47 @@ class MatrixFactorizationModel:
             return self.item_embeddings.mean(axis=0)
         
         return self.item_embeddings[idx]
+
+    def get_user_embeddings(self, user_ids: List[str]) -> Optional[np.ndarray]:
+        """
+        Get embeddings for many users as one (n_users, embedding_dim) array.
+
+        Unknown users get the mean embedding, as in get_user_embedding.
+        """
+        if not self.is_fitted:
+            return None
+        return self._gather_embeddings(self.user_embeddings, self.user_id_map, user_ids)
+
+    def get_item_embeddings(self, item_ids: List[str]) -> Optional[np.ndarray]:
+        """
+        Get embeddings for many items as one (n_items, embedding_dim) array.
+
+        Unknown items get the mean embedding, as in get_item_embedding.
+        """
+        if not self.is_fitted:
+            return None
+        return self._gather_embeddings(self.item_embeddings, self.item_id_map, item_ids)
+
+    @staticmethod
+    def _gather_embeddings(
+        embeddings: np.ndarray,
+        id_map: Dict[str, int],
+        ids: List[str]
+    ) -> np.ndarray:
+        """Gather rows for ids in one fancy-index copy; unknown ids get the mean row."""
+        rows = np.fromiter((id_map.get(i, -1) for i in ids), dtype=np.intp, count=len(ids))
+        unknown = rows < 0
+        gathered = embeddings[np.where(unknown, 0, rows)]
+        if unknown.any():
+            gathered[unknown] = embeddings.mean(axis=0)
+        return gathered
     
     def recommend_for_user(
         self,
         user_id: str,
         n: int = 10,
         filter_items: Optional[List[str]] = None
-    ) -> List[Tuple[str, float]]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate recommendations for a user.
         
@@ -200,10 +257,11 @@ class MatrixFactorizationModel:
             filter_items: Items to exclude from recommendations
             
         Returns:
-            List of (item_id, score) tuples
+            Parallel (item_ids, scores) arrays, best first; item_ids is an
+            object array of str, scores is float32
         """
         if not self.is_fitted:
-            return []
+            return self._ranked_arrays([], np.empty(0))
         
         user_idx = self.user_id_map.get(user_id)
         if user_idx is None:
@@ -224,14 +282,62 @@ class MatrixFactorizationModel:
         # Get top N
         top_indices = np.argsort(scores)[::-1][:n]
         
-        recommendations = [
-            (self.reverse_item_map[idx], float(scores[idx]))
-            for idx in top_indices
-            if idx in self.reverse_item_map
-        ]
-        
-        return recommendations
-    
+        return self._ranked_arrays(top_indices, scores)
+
+    def recommend_for_users(
+        self,
+        user_ids: List[str],
+        n: int = 10
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generate recommendations for several users at once.
+
+        Known users are scored with a single (B, D) x (D, n_items) matrix
+        product instead of one dot product per user.
+
+        Args:
+            user_ids: User identifiers
+            n: Number of recommendations per user
+
+        Returns:
+            One (item_ids, scores) pair per user, in input order, as
+            returned by recommend_for_user
+        """
+        if not self.is_fitted:
+            return [self._ranked_arrays([], np.empty(0)) for _ in user_ids]
+
+        user_indices = [self.user_id_map.get(user_id) for user_id in user_ids]
+        known = [pos for pos, idx in enumerate(user_indices) if idx is not None]
+
+        results: List[Tuple[np.ndarray, np.ndarray]] = [None] * len(user_ids)
+        if known:
+            queries = self.user_embeddings[[user_indices[pos] for pos in known]]
+            scores = queries @ self.item_embeddings.T
+
+            # Only the top-n columns of each row need ordering: partition,
+            # then sort that (B, n) slice instead of the full (B, n_items) matrix
+            k = max(min(n, scores.shape[1]), 0)
+            if 0 < k < scores.shape[1]:
+                top_indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top_indices = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)[:, :k]
+            top_scores = np.take_along_axis(scores, top_indices, axis=1)
+            top_indices = np.take_along_axis(
+                top_indices, np.argsort(-top_scores, axis=1, kind="stable"), axis=1
+            )
+
+            for row, pos in enumerate(known):
+                results[pos] = self._ranked_arrays(top_indices[row], scores[row])
+
+        if len(known) < len(user_ids):
+            # Cold start: every unknown user gets the same popular items
+            popular = self._recommend_popular(n)
+            for pos, idx in enumerate(user_indices):
+                if idx is None:
+                    results[pos] = popular
+
+        return results
+
     def find_similar_items(
         self,
         item_id: str,
@@ -301,20 +407,17 @@ class MatrixFactorizationModel:
         if not self.is_fitted or not recent_items:
             return self.get_user_embedding(user_id)
         
-        # Get embeddings for recent items
-        item_embeddings_list = []
+        # Get embeddings for recent items: one gather, weighted in place
         weights = recent_weights or [1.0] * len(recent_items)
-        
-        for item_id, weight in zip(recent_items, weights):
-            item_emb = self.get_item_embedding(item_id)
-            if item_emb is not None:
-                item_embeddings_list.append(item_emb * weight)
-        
-        if not item_embeddings_list:
+        n_recent = min(len(recent_items), len(weights))
+        if n_recent == 0:
             return self.get_user_embedding(user_id)
         
+        item_embeddings = self.get_item_embeddings(recent_items[:n_recent])
+        item_embeddings *= np.asarray(weights[:n_recent], dtype=item_embeddings.dtype)[:, None]
+        
         # Weighted average of item embeddings
-        new_embedding = np.mean(item_embeddings_list, axis=0)
+        new_embedding = item_embeddings.mean(axis=0)
         
         # Blend with existing embedding (if user exists)
         existing_emb = self.get_user_embedding(user_id)
@@ -325,20 +428,32 @@ class MatrixFactorizationModel:
         
         return new_embedding / np.linalg.norm(new_embedding)
     
-    def _recommend_popular(self, n: int) -> List[Tuple[str, float]]:
+    def _recommend_popular(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
         """Recommend most popular items (cold start fallback)."""
         if not self.is_fitted:
-            return []
+            return self._ranked_arrays([], np.empty(0))
         
         # Compute item popularity as embedding magnitude
         popularities = np.linalg.norm(self.item_embeddings, axis=1)
         top_indices = np.argsort(popularities)[::-1][:n]
         
-        return [
-            (self.reverse_item_map[idx], float(popularities[idx]))
-            for idx in top_indices
-            if idx in self.reverse_item_map
-        ]
+        return self._ranked_arrays(top_indices, popularities)
+
+    def _ranked_arrays(
+        self,
+        top_indices,
+        scores: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Map ranked item indices to parallel (item_ids, scores) arrays."""
+        top_indices = np.asarray(
+            [idx for idx in top_indices if idx in self.reverse_item_map],
+            dtype=np.intp
+        )
+        item_ids = np.array(
+            [self.reverse_item_map[idx] for idx in top_indices],
+            dtype=object
+        )
+        return item_ids, scores[top_indices].astype(np.float32)
     
     def save(self, path: str):
         """Save model to disk."""
@@ -5,7 +5,7 @@ Stores and retrieves real-time user and item features for recommendation.
 Supports TTL, sliding windows, and aggregations.
 """
 
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 import json
 import numpy as np
 from datetime import datetime, timedelta
@@ -84,6 +84,17 @@ class RedisFeatureStore:
         """Generate namespaced Redis key."""
         return f"{namespace}:{key}"
     
+    @staticmethod
+    def _encode_embedding(embedding: np.ndarray) -> bytes:
+        """Serialize an embedding as float16 (half the bytes of float32)."""
+        return np.asarray(embedding, dtype=np.float16).tobytes()
+    
+    @staticmethod
+    def _decode_embedding(data: bytes, dim: int) -> np.ndarray:
+        """Deserialize an embedding to float32, accepting float16 or legacy float32 values."""
+        dtype = np.float16 if len(data) == dim * 2 else np.float32
+        return np.frombuffer(data, dtype=dtype).astype(np.float32).reshape(dim)
+    
     # ==================== User Features ====================
     
     def increment_user_interaction(
@@ -267,8 +278,8 @@ class RedisFeatureStore:
             return
         
         key = self._key("user_embedding", user_id)
-        # Store as binary numpy array
-        self.redis_client.set(key, embedding.tobytes())
+        # Store as binary float16 numpy array
+        self.redis_client.set(key, self._encode_embedding(embedding))
         self.redis_client.expire(key, self.ttl_seconds)
     
     def get_user_embedding(self, user_id: str, dim: int = 64) -> Optional[np.ndarray]:
@@ -292,7 +303,7 @@ class RedisFeatureStore:
         data = self.redis_client.get(key)
         
         if data:
-            return np.frombuffer(data, dtype=np.float32).reshape(dim)
+            return self._decode_embedding(data, dim)
         return None
     
     def set_item_embedding(self, item_id: str, embedding: np.ndarray):
@@ -302,7 +313,7 @@ class RedisFeatureStore:
             return
         
         key = self._key("item_embedding", item_id)
-        self.redis_client.set(key, embedding.tobytes())
+        self.redis_client.set(key, self._encode_embedding(embedding))
         self.redis_client.expire(key, self.ttl_seconds)
     
     def get_item_embedding(self, item_id: str, dim: int = 64) -> Optional[np.ndarray]:
@@ -317,7 +328,7 @@ class RedisFeatureStore:
         data = self.redis_client.get(key)
         
         if data:
-            return np.frombuffer(data, dtype=np.float32).reshape(dim)
+            return self._decode_embedding(data, dim)
         return None
     
     # ==================== Batch Operations ====================
@@ -342,7 +353,7 @@ class RedisFeatureStore:
         result = {}
         for uid, data in zip(user_ids, values):
             if data:
-                result[uid] = np.frombuffer(data, dtype=np.float32).reshape(dim)
+                result[uid] = self._decode_embedding(data, dim)
         
         return result
     
@@ -366,10 +377,94 @@ class RedisFeatureStore:
         result = {}
         for iid, data in zip(item_ids, values):
             if data:
-                result[iid] = np.frombuffer(data, dtype=np.float32).reshape(dim)
+                result[iid] = self._decode_embedding(data, dim)
         
         return result
     
+    def set_embeddings_bulk(
+        self,
+        pairs: List[Tuple[str, np.ndarray]],
+        entity: str = "user",
+        batch_size: int = 1000,
+    ):
+        """
+        Store many embeddings at once.
+
+        Equivalent to calling set_user_embedding (or set_item_embedding) for
+        every pair, but the SET/EXPIRE commands are sent through a
+        non-transactional pipeline flushed every batch_size embeddings.
+
+        Args:
+            pairs: (id, embedding) pairs
+            entity: "user" or "item"
+            batch_size: Embeddings per pipeline round trip
+        """
+        if entity not in ("user", "item"):
+            raise ValueError(f"Unknown embedding entity: {entity}")
+
+        if not self.connected or self.redis_client is None:
+            for entity_id, embedding in pairs:
+                self._fallback_store[f"{entity}_emb:{entity_id}"] = embedding.copy()
+            return
+
+        namespace = f"{entity}_embedding"
+        for start in range(0, len(pairs), batch_size):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for entity_id, embedding in pairs[start:start + batch_size]:
+                key = self._key(namespace, entity_id)
+                pipe.set(key, self._encode_embedding(embedding), ex=self.ttl_seconds)
+            pipe.execute()
+
+    def increment_interactions_bulk(
+        self,
+        user_ids: List[str],
+        item_ids: List[str],
+        values: List[float],
+        interaction_type: str = "click",
+        batch_size: int = 5000,
+    ):
+        """
+        Record many interactions at once.
+
+        Equivalent to calling increment_user_interaction and
+        increment_item_popularity for every (user, item, value) triple, but
+        the commands are sent through a non-transactional pipeline flushed
+        every batch_size interactions, and each touched key's TTL is
+        refreshed once per batch.
+
+        Args:
+            user_ids: User identifiers
+            item_ids: Item identifiers (same length as user_ids)
+            values: Increment values (same length as user_ids)
+            interaction_type: Type of interaction (view, click, purchase)
+            batch_size: Interactions per pipeline round trip
+        """
+        if not self.connected or self.redis_client is None:
+            for user_id, item_id, value in zip(user_ids, item_ids, values):
+                self.increment_user_interaction(user_id, interaction_type, item_id, value=value)
+                self.increment_item_popularity(item_id, value=value)
+            return
+
+        for start in range(0, len(user_ids), batch_size):
+            batch = zip(
+                user_ids[start:start + batch_size],
+                item_ids[start:start + batch_size],
+                values[start:start + batch_size],
+            )
+            touched = set()
+            pipe = self.redis_client.pipeline(transaction=False)
+            for user_id, item_id, value in batch:
+                stats_key = self._key("user_stats", user_id)
+                affinity_key = self._key(f"user_affinity:{user_id}", item_id)
+                popularity_key = self._key("item_popularity", item_id)
+                pipe.hincrby(stats_key, interaction_type, int(value))
+                pipe.incrbyfloat(affinity_key, value)
+                pipe.incrbyfloat(popularity_key, value)
+                touched.update((stats_key, affinity_key, popularity_key))
+            for key in touched:
+                pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+
     # ==================== Aggregated Features ====================
     
     def compute_user_features(self, user_id: str) -> Dict[str, float]:
@@ -17,6 +17,14 @@ import pickle
 
 logger = logging.getLogger(__name__)
 
+# Batches at least this large are searched on a GPU copy of the index
+# (when one is available); smaller ones are dominated by transfer overhead
+GPU_SEARCH_MIN_QUERIES = 1024
+
+# Vectors per index.add call; bounds FAISS's per-call working buffers on
+# multi-million item builds
+ADD_BATCH_SIZE = 1_000_000
+
 
 class FAISSVectorStore:
     """
@@ -38,10 +46,11 @@ class FAISSVectorStore:
     FAISS uses:
     - IndexFlatIP: Exact inner product search
     - IndexIVFFlat: Inverted file index with K-means clustering
+    - IndexIVFPQ: IVF with product-quantized (compressed) vectors
     - IndexHNSW: Hierarchical navigable small world graphs
     
     For <1M items: IndexFlatIP is fast enough (<5ms)
-    For >1M items: Use IndexIVFFlat or IndexHNSW
+    For >1M items: Use IndexIVFFlat, IndexIVFPQ or IndexHNSW
     
     Why This is AI:
     --------------
@@ -54,8 +63,12 @@ class FAISSVectorStore:
     def __init__(
         self,
         embedding_dim: int = 64,
-        index_type: str = "flat",  # "flat", "ivf", "hnsw"
-        metric: str = "ip"  # "ip" (inner product) or "l2" (euclidean)
+        index_type: str = "flat",  # "flat", "ivf", "ivfpq", "hnsw"
+        metric: str = "ip",  # "ip" (inner product) or "l2" (euclidean)
+        nlist: int = 100,
+        pq_m: int = 8,
+        pq_nbits: int = 8,
+        nprobe: int = 16
     ):
         """
         Initialize FAISS vector store.
@@ -64,32 +77,56 @@ class FAISSVectorStore:
             embedding_dim: Dimensionality of embeddings
             index_type: Type of FAISS index
             metric: Distance metric
+            nlist: Number of IVF clusters (ivf, ivfpq)
+            pq_m: PQ sub-quantizers; must divide embedding_dim (ivfpq)
+            pq_nbits: Bits per PQ code (ivfpq)
+            nprobe: Clusters visited per IVF query (recall/speed trade-off)
         """
         self.embedding_dim = embedding_dim
         self.index_type = index_type
         self.metric = metric
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.nprobe = nprobe
         
         # Create FAISS index
-        if index_type == "flat":
-            if metric == "ip":
-                self.index = faiss.IndexFlatIP(embedding_dim)
-            else:
-                self.index = faiss.IndexFlatL2(embedding_dim)
-        elif index_type == "ivf":
-            # IVF index with 100 clusters
-            quantizer = faiss.IndexFlatIP(embedding_dim)
-            self.index = faiss.IndexIVFFlat(quantizer, embedding_dim, 100)
-        elif index_type == "hnsw":
-            self.index = faiss.IndexHNSWFlat(embedding_dim, 32)
-        else:
-            raise ValueError(f"Unknown index type: {index_type}")
+        self.index = self._create_index()
         
         self.item_id_map: Dict[int, str] = {}  # index -> item_id
         self.item_embeddings: Optional[np.ndarray] = None
         self.is_trained = False
         
+        # Lazily-built GPU copy of the index for large batch searches
+        self._gpu_resources = None
+        self._gpu_index = None
+        
         logger.info(f"Initialized FAISS {index_type} index with dim={embedding_dim}")
     
+    def _create_index(self):
+        """Build an empty FAISS index for the configured type and metric."""
+        d = self.embedding_dim
+        if self.index_type == "flat":
+            if self.metric == "ip":
+                return faiss.IndexFlatIP(d)
+            return faiss.IndexFlatL2(d)
+        if self.index_type in ("ivf", "ivfpq"):
+            if self.metric == "ip":
+                quantizer, faiss_metric = faiss.IndexFlatIP(d), faiss.METRIC_INNER_PRODUCT
+            else:
+                quantizer, faiss_metric = faiss.IndexFlatL2(d), faiss.METRIC_L2
+            if self.index_type == "ivf":
+                index = faiss.IndexIVFFlat(quantizer, d, self.nlist, faiss_metric)
+            else:
+                index = faiss.IndexIVFPQ(
+                    quantizer, d, self.nlist, self.pq_m, self.pq_nbits, faiss_metric
+                )
+            index.nprobe = self.nprobe
+            return index
+        if self.index_type == "hnsw":
+            return faiss.IndexHNSWFlat(d, 32)
+        raise ValueError(f"Unknown index type: {self.index_type}")
+    
     def add_items(
         self,
         item_ids: List[str],
@@ -113,15 +150,26 @@ class FAISSVectorStore:
             norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
             embeddings = embeddings / (norms + 1e-8)
         
+        # One contiguous float32 copy (none if already so) shared by train and add
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        
         # Train index if needed (for IVF)
-        if self.index_type == "ivf" and not self.is_trained:
+        if self.index_type in ("ivf", "ivfpq") and not self.is_trained:
             logger.info("Training IVF index...")
-            self.index.train(embeddings.astype(np.float32))
+            if getattr(faiss, "get_num_gpus", lambda: 0)() > 0:
+                # k-means on GPU, then bring the trained index back to CPU
+                # so add/search/save behave the same as the CPU-only path
+                gpu_index = faiss.index_cpu_to_all_gpus(self.index)
+                gpu_index.train(embeddings)
+                self.index = faiss.index_gpu_to_cpu(gpu_index)
+            else:
+                self.index.train(embeddings)
             self.is_trained = True
         
-        # Add to index
+        # Add to index, in ADD_BATCH_SIZE slices (views, no copies)
         start_idx = self.index.ntotal
-        self.index.add(embeddings.astype(np.float32))
+        for start in range(0, len(embeddings), ADD_BATCH_SIZE):
+            self.index.add(embeddings[start:start + ADD_BATCH_SIZE])
         
         # Update ID mapping
         for i, item_id in enumerate(item_ids):
@@ -210,8 +258,11 @@ class FAISSVectorStore:
             queries_norm = query_embeddings
         
         # Search
-        distances, indices = self.index.search(
-            queries_norm.astype(np.float32),
+        index = self.index
+        if len(queries_norm) >= GPU_SEARCH_MIN_QUERIES:
+            index = self._get_gpu_index() or self.index
+        distances, indices = index.search(
+            np.ascontiguousarray(queries_norm, dtype=np.float32),
             top_k
         )
         
@@ -229,6 +280,32 @@ class FAISSVectorStore:
         
         return batch_results
     
+    def _get_gpu_index(self):
+        """
+        Return a single-GPU copy of the index, or None without a GPU.
+        
+        The copy is made once and reused until items are added, so a batch
+        search pays one index transfer rather than one per query.
+        """
+        if getattr(faiss, "get_num_gpus", lambda: 0)() == 0:
+            return None
+        
+        if self._gpu_index is None or self._gpu_index.ntotal != self.index.ntotal:
+            try:
+                if self._gpu_resources is None:
+                    self._gpu_resources = faiss.StandardGpuResources()
+                self._gpu_index = faiss.index_cpu_to_gpu(
+                    self._gpu_resources, 0, self.index
+                )
+                if hasattr(self._gpu_index, 'nprobe'):
+                    self._gpu_index.nprobe = self.nprobe
+            except RuntimeError as e:
+                # e.g. HNSW has no GPU implementation
+                logger.warning(f"GPU search unavailable for {self.index_type} index: {e}")
+                self._gpu_index = None
+        
+        return self._gpu_index
+    
     def update_item(
         self,
         item_id: str,
@@ -297,6 +374,10 @@ class FAISSVectorStore:
             'index_type': self.index_type,
             'metric': self.metric,
             'is_trained': self.is_trained,
+            'nlist': self.nlist,
+            'pq_m': self.pq_m,
+            'pq_nbits': self.pq_nbits,
+            'nprobe': self.nprobe,
         }
         
         with open(path_obj.with_suffix('.meta'), 'wb') as f:
@@ -317,11 +398,17 @@ class FAISSVectorStore:
         store = cls(
             embedding_dim=metadata['embedding_dim'],
             index_type=metadata['index_type'],
-            metric=metadata['metric']
+            metric=metadata['metric'],
+            nlist=metadata.get('nlist', 100),
+            pq_m=metadata.get('pq_m', 8),
+            pq_nbits=metadata.get('pq_nbits', 8),
+            nprobe=metadata.get('nprobe', 16),
         )
         
         # Load FAISS index
         store.index = faiss.read_index(str(path_obj.with_suffix('.faiss')))
+        if hasattr(store.index, 'nprobe'):
+            store.index.nprobe = store.nprobe
         store.item_id_map = metadata['item_id_map']
         store.is_trained = metadata['is_trained']
         
@@ -343,17 +430,10 @@ class FAISSVectorStore:
             embeddings: All item embeddings
         """
         # Reset index
-        if self.index_type == "flat":
-            if self.metric == "ip":
-                self.index = faiss.IndexFlatIP(self.embedding_dim)
-            else:
-                self.index = faiss.IndexFlatL2(self.embedding_dim)
-        elif self.index_type == "ivf":
-            quantizer = faiss.IndexFlatIP(self.embedding_dim)
-            self.index = faiss.IndexIVFFlat(quantizer, self.embedding_dim, 100)
+        self.index = self._create_index()
+        self._gpu_index = None
+        if self.index_type in ("ivf", "ivfpq"):
             self.is_trained = False
-        elif self.index_type == "hnsw":
-            self.index = faiss.IndexHNSWFlat(self.embedding_dim, 32)
         
         self.item_id_map = {}
         
@@ -82,8 +82,10 @@ def train_model():
         # Create sparse matrix
         rows = [user_to_idx[uid] for uid in interactions['user_id']]
         cols = [item_to_idx[iid] for iid in interactions['item_id']]
-        data = np.ones(len(interactions))
-        user_item_matrix = csr_matrix((data, (rows, cols)), shape=(len(user_ids), len(item_ids)))
+        data = np.ones(len(interactions), dtype=np.float32)
+        user_item_matrix = csr_matrix(
+            (data, (rows, cols)), shape=(len(user_ids), len(item_ids)), dtype=np.float32
+        )
         
         # Train model
         model = implicit.als.AlternatingLeastSquares(
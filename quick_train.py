@@ -31,9 +31,12 @@ item_id_map = {id: idx for idx, id in enumerate(item_ids)}
 
 rows = interactions['user_idx'].map(user_id_map).values
 cols = interactions['item_idx'].map(item_id_map).values
-data = interactions['engagement'].values
+data = interactions['engagement'].to_numpy(dtype=np.float32)
 
-user_item_matrix = csr_matrix((data, (rows, cols)), shape=(len(user_ids), len(item_ids)))
+# float32 matrix: ALS trains in float32, so float64 would just be copied down
+user_item_matrix = csr_matrix(
+    (data, (rows, cols)), shape=(len(user_ids), len(item_ids)), dtype=np.float32
+)
 
 # Train model
 print("Training ALS model (this takes ~30 seconds)...")
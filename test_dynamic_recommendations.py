@@ -11,42 +11,67 @@ This proves that the system is now personalized:
 import asyncio
 import httpx
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+try:
+    import uvloop  # optional: libuv-backed event loop with lower per-task overhead
+except ImportError:
+    uvloop = None
 
 BASE_URL = "http://localhost:8000"
 
-async def send_event(user_id: str, item_id: str, event_type: str = "click"):
-    """Send a user interaction event."""
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BASE_URL}/api/v1/event",
-            json={
+# One pooled client for the whole run instead of a new connection per call
+_client: Optional[httpx.AsyncClient] = None
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _client
+
+async def send_events(user_id: str, events: List[tuple]):
+    """Send a user's (item_id, event_type) interactions in one batch request."""
+    response = await get_client().post(
+        "/api/v1/events/batch",
+        json=[
+            {
                 "user_id": user_id,
                 "item_id": item_id,
                 "event_type": event_type,
                 "timestamp": time.time(),
                 "metadata": {}
             }
-        )
-        return response.status_code == 200
+            for item_id, event_type in events
+        ]
+    )
+    return response.status_code == 200
 
 async def get_recommendations(user_id: str, k: int = 5) -> List[str]:
     """Get recommendations for a user."""
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BASE_URL}/api/v1/recommend",
-            json={
-                "user_id": user_id,
-                "num_recommendations": k,
-                "context": {}
-            }
-        )
-        if response.status_code == 200:
-            data = response.json()
-            # Extract item_ids from recommendations list
-            recommendations = data.get("recommendations", [])
-            return [rec["item_id"] for rec in recommendations]
-        return []
+    response = await get_client().post(
+        "/api/v1/recommend",
+        json={
+            "user_id": user_id,
+            "num_recommendations": k,
+            "context": {}
+        }
+    )
+    if response.status_code == 200:
+        data = response.json()
+        # Extract item_ids from recommendations list
+        recommendations = data.get("recommendations", [])
+        return [rec["item_id"] for rec in recommendations]
+    return []
+
+async def run_interactions(user_id: str, label: str, steps: List[tuple]) -> List[str]:
+    """Send one user's (item_id, event_type, verb) steps as one ordered batch; return the log lines."""
+    await send_events(user_id, [(item_id, event_type) for item_id, event_type, _ in steps])
+    return [f"   ↳ User {label} {verb} '{item_id}'" for item_id, _, verb in steps]
 
 async def test_dynamic_behavior():
     """
@@ -64,40 +89,53 @@ async def test_dynamic_behavior():
     print("=" * 80)
     print()
     
+    ts = int(time.time())
+    user_new = f"new_user_{ts}"
+    user_a = f"user_a_{ts}"
+    user_b = f"user_b_{ts}"
+    user_c = f"user_c_{ts}"
+    
+    # Users are independent, so tests 1-4 run concurrently (each user's
+    # events still go out in order); output is printed afterwards in order
+    recs_new, recs_a_before = await asyncio.gather(
+        get_recommendations(user_new, k=5),
+        get_recommendations(user_a, k=5),
+    )
+    log_a, log_b, log_c = await asyncio.gather(
+        run_interactions(user_a, "A", [
+            ("item_1", "click", "clicked"),
+            ("item_2", "click", "clicked"),
+            ("item_3", "view", "viewed"),
+        ]),
+        run_interactions(user_b, "B", [
+            ("item_5", "click", "clicked"),
+            ("item_10", "click", "clicked"),
+            ("item_15", "like", "liked"),
+        ]),
+        run_interactions(user_c, "C", [
+            ("item_7", "view", "viewed"),
+            ("item_7", "click", "clicked"),
+            ("item_7", "purchase", "PURCHASED"),
+            ("item_8", "purchase", "PURCHASED"),
+        ]),
+    )
+    recs_a_after, recs_b, recs_c = await asyncio.gather(
+        get_recommendations(user_a, k=5),
+        get_recommendations(user_b, k=5),
+        get_recommendations(user_c, k=5),
+    )
+    
     # Test 1: New users (cold start)
     print("📋 Test 1: Brand new users (cold start)")
     print("-" * 80)
-    
-    user_new = f"new_user_{int(time.time())}"
-    recs_new = await get_recommendations(user_new, k=5)
     print(f"✅ User '{user_new}' (NEW) → Recommendations: {recs_new}")
     print()
     
     # Test 2: User A - clicks on category 'item'
     print("📋 Test 2: User A - Multiple clicks on 'item_X' category")
     print("-" * 80)
-    
-    user_a = f"user_a_{int(time.time())}"
-    
-    # Get baseline recommendations
-    recs_a_before = await get_recommendations(user_a, k=5)
     print(f"Before interactions: {recs_a_before}")
-    
-    # User A clicks several items
-    await send_event(user_a, "item_1", "click")
-    print(f"   ↳ User A clicked 'item_1'")
-    await asyncio.sleep(0.1)
-    
-    await send_event(user_a, "item_2", "click")
-    print(f"   ↳ User A clicked 'item_2'")
-    await asyncio.sleep(0.1)
-    
-    await send_event(user_a, "item_3", "view")
-    print(f"   ↳ User A viewed 'item_3'")
-    await asyncio.sleep(0.1)
-    
-    # Get updated recommendations
-    recs_a_after = await get_recommendations(user_a, k=5)
+    print("\n".join(log_a))
     print(f"✅ After interactions: {recs_a_after}")
     
     if recs_a_before != recs_a_after:
@@ -109,50 +147,14 @@ async def test_dynamic_behavior():
     # Test 3: User B - different interaction pattern
     print("📋 Test 3: User B - Different interaction pattern")
     print("-" * 80)
-    
-    user_b = f"user_b_{int(time.time())}"
-    
-    # User B interacts with different items
-    await send_event(user_b, "item_5", "click")
-    print(f"   ↳ User B clicked 'item_5'")
-    await asyncio.sleep(0.1)
-    
-    await send_event(user_b, "item_10", "click")
-    print(f"   ↳ User B clicked 'item_10'")
-    await asyncio.sleep(0.1)
-    
-    await send_event(user_b, "item_15", "like")
-    print(f"   ↳ User B liked 'item_15'")
-    await asyncio.sleep(0.1)
-    
-    recs_b = await get_recommendations(user_b, k=5)
+    print("\n".join(log_b))
     print(f"✅ User B recommendations: {recs_b}")
     print()
     
     # Test 4: User C - heavy engagement (purchases)
     print("📋 Test 4: User C - Heavy engagement with purchases")
     print("-" * 80)
-    
-    user_c = f"user_c_{int(time.time())}"
-    
-    # User C makes purchases
-    await send_event(user_c, "item_7", "view")
-    print(f"   ↳ User C viewed 'item_7'")
-    await asyncio.sleep(0.1)
-    
-    await send_event(user_c, "item_7", "click")
-    print(f"   ↳ User C clicked 'item_7'")
-    await asyncio.sleep(0.1)
-    
-    await send_event(user_c, "item_7", "purchase")
-    print(f"   ↳ User C PURCHASED 'item_7'")
-    await asyncio.sleep(0.1)
-    
-    await send_event(user_c, "item_8", "purchase")
-    print(f"   ↳ User C PURCHASED 'item_8'")
-    await asyncio.sleep(0.1)
-    
-    recs_c = await get_recommendations(user_c, k=5)
+    print("\n".join(log_c))
     print(f"✅ User C recommendations: {recs_c}")
     print()
     
@@ -160,9 +162,12 @@ async def test_dynamic_behavior():
     print("📋 Test 5: Verify feature persistence")
     print("-" * 80)
     
-    recs_a_final = await get_recommendations(user_a, k=5)
-    recs_b_final = await get_recommendations(user_b, k=5)
-    recs_c_final = await get_recommendations(user_c, k=5)
+    # Independent reads: fetch all three users concurrently
+    recs_a_final, recs_b_final, recs_c_final = await asyncio.gather(
+        get_recommendations(user_a, k=5),
+        get_recommendations(user_b, k=5),
+        get_recommendations(user_c, k=5),
+    )
     
     print(f"User A (item_1,2,3):  {recs_a_final}")
     print(f"User B (item_5,10,15): {recs_b_final}")
@@ -203,12 +208,11 @@ async def main():
     """Run the dynamic behavior test."""
     try:
         # Check if server is running
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{BASE_URL}/api/v1/health")
-            if response.status_code != 200:
-                print("❌ ERROR: Backend server not responding")
-                print("   Please start the server with: cd backend && uvicorn app.main:app")
-                return
+        response = await get_client().get("/api/v1/health")
+        if response.status_code != 200:
+            print("❌ ERROR: Backend server not responding")
+            print("   Please start the server with: cd backend && uvicorn app.main:app")
+            return
         
         print("✅ Backend server is running\n")
         await test_dynamic_behavior()
@@ -220,6 +224,10 @@ async def main():
         print(f"❌ ERROR: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        await get_client().aclose()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
@@ -14,12 +14,36 @@ Prerequisites:
     - Backend running: uvicorn app.main:app --reload
 """
 
+import logging
+import os
+import sys
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Tuple
+
+try:
+    import orjson  # optional: C-level JSON encode/decode for request/response bodies
+    _dumps, _loads = orjson.dumps, orjson.loads
+except ImportError:
+    _dumps, _loads = (lambda obj: json.dumps(obj).encode()), json.loads
 
 BASE_URL = "http://localhost:8000"
+HEALTH_URL = f"{BASE_URL}/health"
+REC_URL = f"{BASE_URL}/recommend"
+EVENT_URL = f"{BASE_URL}/event"
+LIVENESS_URL = f"{BASE_URL}/health/live"
+
+# Shared keep-alive session so every call in the run reuses pooled sockets
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+SESSION.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+
+_get_id = itemgetter('item_id')
+
 COLORS = {
     'GREEN': '\033[92m',
     'RED': '\033[91m',
@@ -28,30 +52,60 @@ COLORS = {
     'END': '\033[0m'
 }
 
+# Status lines go through logging so formatting is deferred until a handler
+# accepts the record; set LOGLEVEL=WARNING/ERROR in CI to quiet the run.
+logging.basicConfig(
+    level=os.environ.get("LOGLEVEL", "INFO"),
+    format="%(message)s",
+    stream=sys.stdout,
+)
+logger = logging.getLogger("tests")
+
+_SUCCESS_FMT = f"{COLORS['GREEN']}✅ %s{COLORS['END']}"
+_ERROR_FMT = f"{COLORS['RED']}❌ %s{COLORS['END']}"
+_WARNING_FMT = f"{COLORS['YELLOW']}⚠️  %s{COLORS['END']}"
+_INFO_FMT = f"{COLORS['BLUE']}ℹ️  %s{COLORS['END']}"
+
+# Header rules are built once rather than on every section print
+_SECTION_BAR = "=" * 60
+_SUITE_BAR = "=" * 80
+_SUITE_RULE = "-" * 80
+
 def print_success(msg):
-    print(f"{COLORS['GREEN']}✅ {msg}{COLORS['END']}")
+    logger.info(_SUCCESS_FMT, msg)
 
 def print_error(msg):
-    print(f"{COLORS['RED']}❌ {msg}{COLORS['END']}")
+    logger.error(_ERROR_FMT, msg)
 
 def print_warning(msg):
-    print(f"{COLORS['YELLOW']}⚠️  {msg}{COLORS['END']}")
+    logger.warning(_WARNING_FMT, msg)
 
 def print_info(msg):
-    print(f"{COLORS['BLUE']}ℹ️  {msg}{COLORS['END']}")
+    logger.info(_INFO_FMT, msg)
+
+
+def _poll(fetch, done, timeout, interval=0.02):
+    """Call fetch() with exponential backoff until done(result) or timeout; return the last result"""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = fetch()
+        if done(result) or time.monotonic() >= deadline:
+            return result
+        time.sleep(interval)
+        interval = min(interval * 2, 0.1)
 
 
 def test_health():
     """Test if backend is running."""
-    print("\n" + "="*60)
+    print("\n" + _SECTION_BAR)
     print("Test 1: Backend Health Check")
-    print("="*60)
+    print(_SECTION_BAR)
     
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = SESSION.get(HEALTH_URL, timeout=5)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             print_success("Backend is healthy")
             print(f"   Status: {data.get('status', 'unknown')}")
             return True
@@ -69,46 +123,50 @@ def test_health():
         return False
 
 
-def test_recommendations_before(user_id: str = "test_user_1") -> List[Dict]:
-    """Get initial recommendations."""
-    print("\n" + "="*60)
+def _print_recommendations(recommendations: List[Dict]) -> Tuple[str, ...]:
+    """Print ranked recommendations and return their item ids."""
+    item_ids = []
+    for i, rec in enumerate(recommendations):
+        item_id = rec.get('item_id', 'unknown')
+        item_ids.append(item_id)
+        print(f"   {i+1}. Item: {item_id} (score: {rec.get('score', 'N/A')})")
+    return tuple(item_ids)
+
+
+def test_recommendations_before(user_id: str = "test_user_1") -> Tuple[str, ...]:
+    """Get initial recommendations (returns the top item ids)."""
+    print("\n" + _SECTION_BAR)
     print("Test 2: Get Initial Recommendations")
-    print("="*60)
+    print(_SECTION_BAR)
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/recommend",
-            json={"user_id": user_id, "num_recommendations": 5},
+        response = SESSION.post(
+            REC_URL,
+            data=_dumps({"user_id": user_id, "num_recommendations": 5}),
             timeout=5
         )
         
         if response.status_code == 200:
-            data = response.json()
-            recommendations = data.get('recommendations', [])
+            recommendations = _loads(response.content).get('recommendations', [])
             
             print_success(f"Received {len(recommendations)} recommendations")
             print(f"\nRecommendations for user '{user_id}' BEFORE interaction:")
             
-            for i, rec in enumerate(recommendations[:5]):
-                item_id = rec.get('item_id', 'unknown')
-                score = rec.get('score', 'N/A')
-                print(f"   {i+1}. Item: {item_id} (score: {score})")
-            
-            return recommendations
+            return _print_recommendations(recommendations[:5])
         else:
             print_error(f"Recommendation request failed: HTTP {response.status_code}")
-            return []
+            return ()
             
     except Exception as e:
         print_error(f"Recommendation error: {e}")
-        return []
+        return ()
 
 
 def test_send_event(user_id: str = "test_user_1", item_id: str = "item_50"):
     """Send interaction event."""
-    print("\n" + "="*60)
+    print("\n" + _SECTION_BAR)
     print("Test 3: Send User Interaction Event")
-    print("="*60)
+    print(_SECTION_BAR)
     
     event = {
         "user_id": user_id,
@@ -118,14 +176,14 @@ def test_send_event(user_id: str = "test_user_1", item_id: str = "item_50"):
     }
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/event",
-            json=event,
+        response = SESSION.post(
+            EVENT_URL,
+            data=_dumps(event),
             timeout=5
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             print_success("Event logged successfully")
             print(f"   User: {user_id}")
             print(f"   Item: {item_id}")
@@ -140,56 +198,60 @@ def test_send_event(user_id: str = "test_user_1", item_id: str = "item_50"):
         return False
 
 
-def test_recommendations_after(user_id: str = "test_user_1") -> List[Dict]:
-    """Get recommendations after interaction."""
-    print("\n" + "="*60)
+def test_recommendations_after(user_id: str = "test_user_1", previous_ids: Tuple[str, ...] = None) -> Tuple[str, ...]:
+    """Get recommendations after interaction (returns the top item ids)."""
+    print("\n" + _SECTION_BAR)
     print("Test 4: Get Recommendations After Interaction")
-    print("="*60)
-    
-    # Wait a moment for processing
-    time.sleep(1)
+    print(_SECTION_BAR)
     
-    try:
-        response = requests.post(
-            f"{BASE_URL}/recommend",
-            json={"user_id": user_id, "num_recommendations": 5},
+    def fetch():
+        response = SESSION.post(
+            REC_URL,
+            data=_dumps({"user_id": user_id, "num_recommendations": 5}),
             timeout=5
         )
+        # Decode once here; the poll predicate and the report share the result
+        data = _loads(response.content) if response.status_code == 200 else None
+        return response, data
+    
+    def changed(result):
+        _, data = result
+        if data is None or previous_ids is None:
+            return True
+        return tuple(map(_get_id, data.get('recommendations', [])[:5])) != previous_ids
+    
+    try:
+        # Poll for up to a second instead of sleeping a fixed second for processing
+        response, data = _poll(fetch, changed, timeout=1.0)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             recommendations = data.get('recommendations', [])
             
             print_success(f"Received {len(recommendations)} recommendations")
             print(f"\nRecommendations for user '{user_id}' AFTER interaction:")
             
-            for i, rec in enumerate(recommendations[:5]):
-                item_id = rec.get('item_id', 'unknown')
-                score = rec.get('score', 'N/A')
-                print(f"   {i+1}. Item: {item_id} (score: {score})")
-            
-            return recommendations
+            return _print_recommendations(recommendations[:5])
         else:
             print_error(f"Recommendation request failed: HTTP {response.status_code}")
-            return []
+            return ()
             
     except Exception as e:
         print_error(f"Recommendation error: {e}")
-        return []
+        return ()
 
 
 def test_learning_behavior():
     """Test if recommendations change (learning behavior)."""
-    print("\n" + "="*80)
+    print("\n" + _SUITE_BAR)
     print("🧠 TESTING LEARNING BEHAVIOR")
-    print("="*80)
+    print(_SUITE_BAR)
     
     user_id = "test_user_1"
     
     # Get initial recommendations
-    recs_before = test_recommendations_before(user_id)
+    before_ids = test_recommendations_before(user_id)
     
-    if not recs_before:
+    if not before_ids:
         print_error("Cannot test learning - no initial recommendations")
         return False
     
@@ -199,19 +261,16 @@ def test_learning_behavior():
         return False
     
     # Get recommendations after
-    recs_after = test_recommendations_after(user_id)
+    after_ids = test_recommendations_after(user_id, before_ids)
     
-    if not recs_after:
+    if not after_ids:
         print_error("Cannot test learning - no recommendations after interaction")
         return False
     
     # Compare
-    before_ids = [r.get('item_id') for r in recs_before]
-    after_ids = [r.get('item_id') for r in recs_after]
-    
-    print("\n" + "="*80)
+    print("\n" + _SUITE_BAR)
     print("LEARNING ANALYSIS")
-    print("="*80)
+    print(_SUITE_BAR)
     
     if before_ids != after_ids:
         print_success("Recommendations CHANGED after interaction!")
@@ -231,25 +290,39 @@ def test_learning_behavior():
 
 def test_multiple_users():
     """Test that different users get different recommendations."""
-    print("\n" + "="*80)
+    print("\n" + _SUITE_BAR)
     print("👥 TESTING PERSONALIZATION (Multiple Users)")
-    print("="*80)
+    print(_SUITE_BAR)
     
     users = ["user_A", "user_B", "user_C"]
     all_recommendations = {}
     
-    for user_id in users:
+    # Requests are independent, so fire them concurrently over the shared pool
+    with ThreadPoolExecutor(max_workers=len(users)) as executor:
+        # Open one keep-alive socket per worker before the measured requests;
+        # HEAD skips the body and any status (even 405) proves the socket is up
         try:
-            response = requests.post(
-                f"{BASE_URL}/recommend",
-                json={"user_id": user_id, "num_recommendations": 5},
+            list(executor.map(lambda _: SESSION.head(LIVENESS_URL, timeout=5), users))
+        except requests.RequestException:
+            pass  # warm-up only; per-user errors are reported below
+        futures = {
+            user_id: executor.submit(
+                SESSION.post,
+                REC_URL,
+                data=_dumps({"user_id": user_id, "num_recommendations": 5}),
                 timeout=5
             )
+            for user_id in users
+        }
+    
+    for user_id, future in futures.items():
+        try:
+            response = future.result()
             
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 recs = data.get('recommendations', [])
-                rec_ids = [r.get('item_id') for r in recs[:5]]
+                rec_ids = tuple(map(_get_id, recs[:5]))
                 all_recommendations[user_id] = rec_ids
                 
                 print(f"\n{user_id}: {rec_ids}")
@@ -264,10 +337,10 @@ def test_multiple_users():
         print_warning("Not enough users to test personalization")
         return False
     
-    unique_recs = len(set(tuple(recs) for recs in all_recommendations.values()))
+    unique_recs = len(set(all_recommendations.values()))
     total_users = len(all_recommendations)
     
-    print("\n" + "-"*80)
+    print("\n" + _SUITE_RULE)
     if unique_recs == total_users:
         print_success(f"All {total_users} users got DIFFERENT recommendations!")
         print_info("System is personalizing! 🎉")
@@ -284,9 +357,9 @@ def test_multiple_users():
 
 def run_all_tests():
     """Run complete test suite."""
-    print("\n" + "="*80)
+    print("\n" + _SUITE_BAR)
     print("🧪 REAL-TIME RECOMMENDATION SYSTEM - TEST SUITE")
-    print("="*80)
+    print(_SUITE_BAR)
     
     results = {
         'health': False,
@@ -298,9 +371,9 @@ def run_all_tests():
     results['health'] = test_health()
     
     if not results['health']:
-        print("\n" + "="*80)
+        print("\n" + _SUITE_BAR)
         print_error("TESTS ABORTED - Backend not available")
-        print("="*80)
+        print(_SUITE_BAR)
         return False
     
     # Test 2: Learning
@@ -310,18 +383,19 @@ def run_all_tests():
     results['personalization'] = test_multiple_users()
     
     # Final summary
-    print("\n" + "="*80)
+    print("\n" + _SUITE_BAR)
     print("📊 TEST SUMMARY")
-    print("="*80)
-    
-    passed = sum(results.values())
-    total = len(results)
+    print(_SUITE_BAR)
     
+    # Count passes while printing the rows instead of a separate sum() pass
+    passed = 0
     for test_name, passed_flag in results.items():
+        passed += passed_flag
         status = "✅ PASS" if passed_flag else "❌ FAIL"
         print(f"{status} - {test_name.title()}")
+    total = len(results)
     
-    print("\n" + "-"*80)
+    print("\n" + _SUITE_RULE)
     print(f"Results: {passed}/{total} tests passed")
     
     if passed == total:
@@ -335,7 +409,7 @@ def run_all_tests():
     else:
         print_error("Some tests failed. Check errors above.")
     
-    print("="*80)
+    print(_SUITE_BAR)
     
     return passed == total
 
@@ -347,6 +421,6 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\n\nTests interrupted by user")
         exit(1)
-    except Exception as e:
-        print_error(f"Test suite crashed: {e}")
+    except Exception:
+        logger.exception(_ERROR_FMT, "Test suite crashed")
         exit(1)
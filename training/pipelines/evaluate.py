@@ -9,11 +9,15 @@ This module provides:
 - Threshold-based model rejection
 """
 
+import functools
 import logging
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
 import mlflow
 import numpy as np
+from mlflow import MlflowClient
+from mlflow.entities import Metric
 import pandas as pd
 from sklearn.metrics import (
     average_precision_score,
@@ -24,6 +28,8 @@ from sklearn.metrics import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RELEVANCE_THRESHOLD = 0.3
+
 
 class ModelEvaluator:
     """
@@ -36,25 +42,43 @@ class ModelEvaluator:
     - Threshold validation for model promotion
     """
 
-    def __init__(self, threshold_config: Optional[Dict[str, float]] = None):
+    def __init__(
+        self,
+        threshold_config: Optional[Dict[str, float]] = None,
+        k_values: Tuple[int, ...] = (5, 10, 20),
+    ):
         """
         Initialize evaluator.
 
         Args:
             threshold_config: Minimum thresholds for model promotion
+            k_values: Default K values for ranking metrics
         """
+        self.k_values = tuple(k_values)
+
+        # Rank discounts and ideal-DCG prefix sums depend only on K, so they
+        # are built once here instead of on every evaluation
+        self._discounts, self._idcg_cum = self._discount_tables(max(self.k_values))
+
         self.threshold_config = threshold_config or {
             "recall@10": 0.05,
             "map@10": 0.03,
             "auc": 0.55,
             "rmse": 0.5,
         }
+        # Threshold names and values as parallel arrays for vector comparison
+        self._threshold_names = list(self.threshold_config)
+        self._threshold_values = np.fromiter(
+            self.threshold_config.values(),
+            dtype=np.float64,
+            count=len(self.threshold_config),
+        )
 
     def evaluate(
         self,
         y_true: np.ndarray,
         y_pred: np.ndarray,
-        k_values: List[int] = [5, 10, 20],
+        k_values: Optional[List[int]] = None,
     ) -> Dict[str, float]:
         """
         Comprehensive model evaluation.
@@ -62,36 +86,61 @@ class ModelEvaluator:
         Args:
             y_true: Ground truth labels
             y_pred: Model predictions
-            k_values: K values for ranking metrics
+            k_values: K values for ranking metrics (defaults to the evaluator's)
 
         Returns:
             Dictionary of all evaluation metrics
         """
         metrics = {}
+        k_values = self.k_values if k_values is None else k_values
+
+        # Binary relevance and clipped scores are shared by the metric groups
+        y_binary = (y_true >= RELEVANCE_THRESHOLD).astype(np.uint8)
+        y_pred_proba = np.clip(y_pred, 0.0, 1.0)
 
         # Regression metrics
         metrics.update(self._regression_metrics(y_true, y_pred))
 
         # Ranking metrics
-        metrics.update(self._ranking_metrics(y_true, y_pred, k_values))
+        metrics.update(
+            self._ranking_metrics(y_true, y_pred, k_values, y_binary=y_binary)
+        )
 
         # Classification metrics (at engagement threshold)
-        metrics.update(self._classification_metrics(y_true, y_pred))
+        metrics.update(
+            self._classification_metrics(
+                y_true, y_pred, y_binary=y_binary, y_pred_proba=y_pred_proba
+            )
+        )
 
         return metrics
 
+    @staticmethod
+    def _discount_tables(kmax: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Log2 rank discounts and ideal-DCG prefix sums for ranks 1..kmax."""
+        discounts = 1.0 / np.log2(np.arange(2, kmax + 2))
+        # The ideal ranking places every relevant item first
+        idcg_cum = np.concatenate(([0.0], np.cumsum(discounts)))
+        return discounts, idcg_cum
+
     def _regression_metrics(
         self, y_true: np.ndarray, y_pred: np.ndarray
     ) -> Dict[str, float]:
         """Calculate regression metrics."""
-        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-
-        rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-        mae = mean_absolute_error(y_true, y_pred)
-        r2 = r2_score(y_true, y_pred)
-
-        # Clip predictions to valid range
-        y_pred_clipped = np.clip(y_pred, 0, 1)
+        # Share the residuals across RMSE, MAE and R2
+        diff = y_pred - y_true
+        sq = diff * diff
+        ss_res = float(sq.sum())
+        rmse = np.sqrt(ss_res / len(diff))
+        mae = np.abs(diff).mean()
+
+        centered = y_true - y_true.mean()
+        ss_tot = float(np.dot(centered, centered))
+        if ss_tot > 0:
+            r2 = 1.0 - ss_res / ss_tot
+        else:
+            # Constant target: perfect fit scores 1.0, anything else 0.0
+            r2 = 1.0 if ss_res == 0 else 0.0
 
         return {
             "rmse": float(rmse),
@@ -100,59 +149,94 @@ class ModelEvaluator:
         }
 
     def _ranking_metrics(
-        self, y_true: np.ndarray, y_pred: np.ndarray, k_values: List[int]
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        k_values: List[int],
+        y_binary: Optional[np.ndarray] = None,
     ) -> Dict[str, float]:
         """Calculate ranking-specific metrics."""
         metrics = {}
 
         # Convert to binary relevance at threshold
-        relevance_threshold = 0.3
-        y_binary = (y_true >= relevance_threshold).astype(int)
-
-        # Sort predictions (descending)
-        sorted_indices = np.argsort(y_pred)[::-1]
-
-        # Calculate metrics for each K
-        for k in k_values:
-            top_k_indices = sorted_indices[:k]
-            top_k_relevance = y_binary[top_k_indices]
-
-            # Precision@K
-            precision_k = np.mean(top_k_relevance)
-            metrics[f"precision@{k}"] = float(precision_k)
-
-            # Recall@K
-            total_relevant = np.sum(y_binary)
-            relevant_in_top_k = np.sum(top_k_relevance)
-            recall_k = relevant_in_top_k / total_relevant if total_relevant > 0 else 0
-            metrics[f"recall@{k}"] = float(recall_k)
-
-            # Average Precision@K
-            precision_cumsum = np.cumsum(top_k_relevance) / np.arange(1, k + 1)
-            ap_k = np.sum(precision_cumsum * top_k_relevance) / np.sum(y_binary) if np.sum(y_binary) > 0 else 0
+        if y_binary is None:
+            y_binary = (y_true >= RELEVANCE_THRESHOLD).astype(np.uint8)
+        total_relevant = int(np.count_nonzero(y_binary))
+
+        # Only the top-kmax positions need ordering: partition, then sort
+        # that slice (ties broken by index, as a stable full sort would)
+        n_items = len(y_pred)
+        kmax = min(max(k_values), n_items)
+        if 0 < kmax < n_items:
+            top_indices = np.argpartition(-y_pred, kmax - 1)[:kmax]
+            top_indices = top_indices[np.lexsort((top_indices, -y_pred[top_indices]))]
+        else:
+            top_indices = np.argsort(-y_pred, kind="stable")[:kmax]
+        top = y_binary[top_indices]
+
+        # Prefix sums over the top-kmax slice, with a leading zero so that
+        # entry n holds the value for the first n positions
+        if kmax <= len(self._discounts):
+            discounts = self._discounts[:kmax]
+            idcg_cum = self._idcg_cum[: kmax + 1]
+        else:
+            discounts, idcg_cum = self._discount_tables(kmax)
+        ranks = np.arange(1, kmax + 1)
+        cumrel = np.concatenate(([0], np.cumsum(top, dtype=np.int64)))
+        ap_cum = np.concatenate(([0.0], np.cumsum(cumrel[1:] / ranks * top)))
+        dcg_cum = np.concatenate(([0.0], np.cumsum(top * discounts)))
+
+        # Gather every metric@k in one vectorized lookup
+        ks = np.asarray(k_values)
+        ns = np.minimum(ks, kmax)
+        hits = cumrel[ns].astype(float)
+        precision = np.divide(hits, ns, out=np.zeros_like(hits), where=ns > 0)
+        if total_relevant > 0:
+            recall = hits / total_relevant
+            ap = ap_cum[ns] / total_relevant
+        else:
+            recall = ap = np.zeros_like(hits)
+        idcg = idcg_cum[np.minimum(ns, total_relevant)]
+        ndcg = np.divide(dcg_cum[ns], idcg, out=np.zeros_like(hits), where=idcg > 0)
+
+        for k, p_k, r_k, ap_k, ndcg_k in zip(k_values, precision, recall, ap, ndcg):
+            metrics[f"precision@{k}"] = float(p_k)
+            metrics[f"recall@{k}"] = float(r_k)
             metrics[f"map@{k}"] = float(ap_k)
-
-            # NDCG@K
-            dcg_k = np.sum(top_k_relevance / np.log2(np.arange(2, k + 2)))
-            ideal_relevance = np.sort(y_binary)[::-1][:k]
-            idcg_k = np.sum(ideal_relevance / np.log2(np.arange(2, k + 2)))
-            ndcg_k = dcg_k / idcg_k if idcg_k > 0 else 0
             metrics[f"ndcg@{k}"] = float(ndcg_k)
 
-        # MRR (Mean Reciprocal Rank)
-        first_relevant = np.where(y_binary[sorted_indices] == 1)[0]
-        mr = 1 / (first_relevant[0] + 1) if len(first_relevant) > 0 else 0
+        # MRR (Mean Reciprocal Rank): usually the first relevant item is in
+        # the ranked top slice; otherwise count the items ranked ahead of the
+        # best-scored relevant item in O(N) instead of sorting the whole list
+        if cumrel[-1] > 0:
+            mr = 1 / (int(np.argmax(top)) + 1)
+        elif total_relevant > 0:
+            best = int(np.argmax(np.where(y_binary == 1, y_pred, -np.inf)))
+            best_score = y_pred[best]
+            rank = (
+                np.count_nonzero(y_pred > best_score)
+                + np.count_nonzero(y_pred[:best] == best_score)
+                + 1
+            )
+            mr = 1 / rank
+        else:
+            mr = 0
         metrics["mrr"] = float(mr)
 
         return metrics
 
     def _classification_metrics(
-        self, y_true: np.ndarray, y_pred: np.ndarray
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        y_binary: Optional[np.ndarray] = None,
+        y_pred_proba: Optional[np.ndarray] = None,
     ) -> Dict[str, float]:
         """Calculate classification metrics at engagement threshold."""
-        threshold = 0.3
-        y_binary = (y_true >= threshold).astype(int)
-        y_pred_proba = np.clip(y_pred, 0, 1)
+        if y_binary is None:
+            y_binary = (y_true >= RELEVANCE_THRESHOLD).astype(np.uint8)
+        if y_pred_proba is None:
+            y_pred_proba = np.clip(y_pred, 0, 1)
 
         # AUC-ROC
         auc = roc_auc_score(y_binary, y_pred_proba)
@@ -181,22 +265,41 @@ class ModelEvaluator:
         Returns:
             Tuple of (passed: bool, failures: List[str])
         """
-        failures = []
+        # Missing metrics become +inf and therefore never fail
+        observed = np.fromiter(
+            (metrics.get(name, np.inf) for name in self._threshold_names),
+            dtype=np.float64,
+            count=len(self._threshold_names),
+        )
+        failed = np.flatnonzero(observed < self._threshold_values)
 
-        for metric, threshold in self.threshold_config.items():
-            if metric in metrics:
-                if metrics[metric] < threshold:
-                    failures.append(
-                        f"{metric}={metrics[metric]:.4f} < threshold={threshold:.4f}"
-                    )
+        failures = [
+            f"{self._threshold_names[i]}={observed[i]:.4f} "
+            f"< threshold={self._threshold_values[i]:.4f}"
+            for i in failed
+        ]
 
         return len(failures) == 0, failures
 
 
+@functools.lru_cache(maxsize=8)
+def _load_model(model_uri: str, registry_uri: str):
+    """
+    Load a pyfunc model, reusing it across evaluations in this process.
+
+    The registry URI is part of the key so that "models:/" URIs resolve
+    against the registry in effect. Stage URIs such as
+    "models:/name/Production" are cached as resolved on first load; call
+    _load_model.cache_clear() after promoting a new version.
+    """
+    return mlflow.pyfunc.load_model(model_uri)
+
+
 def evaluate_model(
     model_uri: str,
     test_data: Tuple[np.ndarray, np.ndarray],
     model_name: str = "recommender-model",
+    log: bool = True,
 ) -> Dict[str, float]:
     """
     Evaluate a model from MLflow.
@@ -205,12 +308,13 @@ def evaluate_model(
         model_uri: MLflow model URI
         test_data: Tuple of (X_test, y_test)
         model_name: Name for logging
+        log: Log metrics to the active MLflow run
 
     Returns:
         Dictionary of evaluation metrics
     """
     # Load model
-    model = mlflow.pyfunc.load_model(model_uri)
+    model = _load_model(model_uri, mlflow.get_registry_uri())
 
     # Prepare data
     X_test, y_test = test_data
@@ -222,8 +326,17 @@ def evaluate_model(
     evaluator = ModelEvaluator()
     metrics = evaluator.evaluate(y_test, y_pred)
 
-    # Log to MLflow
-    mlflow.log_metrics(metrics)
+    # Log to MLflow: one log_batch call for the whole metrics dict
+    if log:
+        run = mlflow.active_run() or mlflow.start_run()
+        timestamp = int(time.time() * 1000)
+        MlflowClient().log_batch(
+            run.info.run_id,
+            metrics=[
+                Metric(name, float(value), timestamp, 0)
+                for name, value in metrics.items()
+            ],
+        )
 
     # Check thresholds
     passed, failures = evaluator.check_promotion_thresholds(metrics)
@@ -11,6 +11,7 @@ This module provides:
 """
 
 import logging
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -25,6 +26,9 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How long Production/Staging lookups are reused before re-querying
+LATEST_VERSIONS_TTL_SECONDS = 5.0
+
 
 class ModelRegistry:
     """
@@ -51,6 +55,11 @@ class ModelRegistry:
         """
         self.model_name = model_name
         self.client = MlflowClient(registry_uri or mlflow.get_registry_uri())
+        self._name_filter = f"name = '{model_name}'"
+
+        # Latest Production/Staging versions, keyed by stage
+        self._latest_cache: Dict[str, Any] = {}
+        self._latest_cached_at = float("-inf")
 
     def register_version(
         self,
@@ -62,6 +71,10 @@ class ModelRegistry:
         """
         Register a new model version.
 
+        Returns as soon as the registry has accepted the version, without
+        waiting for the server-side artifact copy; use wait_for_ready
+        before acting on the version.
+
         Args:
             model_uri: URI of the model to register
             version: Version string (defaults to timestamp)
@@ -82,6 +95,7 @@ class ModelRegistry:
             run_id=mlflow.active_run().info.run_id if mlflow.active_run() else None,
             description=description,
             tags=tags,
+            await_creation_for=0,
         )
 
         logger.info(
@@ -90,6 +104,44 @@ class ModelRegistry:
 
         return model_version
 
+    def wait_for_ready(
+        self,
+        version: str,
+        timeout: float = 300.0,
+        poll_interval: float = 1.0,
+    ) -> Any:
+        """
+        Wait until a model version has finished registering.
+
+        Args:
+            version: Model version to wait for
+            timeout: Maximum seconds to wait
+            poll_interval: Seconds between status checks
+
+        Returns:
+            The READY model version
+
+        Raises:
+            RuntimeError: If registration failed
+            TimeoutError: If the version is not ready within timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            mv = self.client.get_model_version(name=self.model_name, version=version)
+            if mv.status == "READY":
+                return mv
+            if mv.status == "FAILED_REGISTRATION":
+                raise RuntimeError(
+                    f"Registration of {self.model_name}/{version} failed: "
+                    f"{mv.status_message}"
+                )
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"{self.model_name}/{version} not ready after {timeout}s "
+                    f"(status: {mv.status})"
+                )
+            time.sleep(poll_interval)
+
     def promote_to_staging(
         self,
         version: str,
@@ -112,6 +164,7 @@ class ModelRegistry:
             archive_existing_versions=True,
             description=message or "Promoted to staging for testing",
         )
+        self._invalidate_latest()
 
         logger.info(
             f"Promoted {self.model_name}/{version} to Staging"
@@ -150,6 +203,7 @@ class ModelRegistry:
             archive_existing_versions=False,
             description=message or "Promoted to production",
         )
+        self._invalidate_latest()
 
         logger.info(
             f"Promoted {self.model_name}/{version} to Production"
@@ -165,6 +219,7 @@ class ModelRegistry:
             stage="Archived",
             description="Archived by new production model",
         )
+        self._invalidate_latest()
 
     def rollback_to_version(
         self,
@@ -193,6 +248,7 @@ class ModelRegistry:
             stage=target_stage,
             description=f"Rollback to version {version}",
         )
+        self._invalidate_latest()
 
         logger.info(
             f"Rolled back {self.model_name} to version {version} in {target_stage}"
@@ -204,15 +260,27 @@ class ModelRegistry:
         """Get latest versions for each stage."""
         return self.client.get_latest_versions(self.model_name, stages)
 
+    def _latest_by_stage(self) -> Dict[str, Any]:
+        """Latest Production and Staging versions, fetched in one call and cached briefly."""
+        now = time.monotonic()
+        if now - self._latest_cached_at > LATEST_VERSIONS_TTL_SECONDS:
+            versions = self.get_latest_versions(stages=["Production", "Staging"])
+            self._latest_cache = {mv.current_stage: mv for mv in versions}
+            self._latest_cached_at = now
+        return self._latest_cache
+
+    def _invalidate_latest(self) -> None:
+        """Drop cached stage lookups after a stage transition."""
+        self._latest_cache = {}
+        self._latest_cached_at = float("-inf")
+
     def get_production_version(self) -> Optional[Any]:
         """Get the current production version."""
-        versions = self.get_latest_versions(stages=["Production"])
-        return versions[0] if versions else None
+        return self._latest_by_stage().get("Production")
 
     def get_staging_version(self) -> Optional[Any]:
         """Get the current staging version."""
-        versions = self.get_latest_versions(stages=["Staging"])
-        return versions[0] if versions else None
+        return self._latest_by_stage().get("Staging")
 
     def get_version_info(self, version: str) -> Dict[str, Any]:
         """Get detailed information about a model version."""
@@ -221,6 +289,11 @@ class ModelRegistry:
             version=version,
         )
 
+        return self._version_to_dict(mv)
+
+    @staticmethod
+    def _version_to_dict(mv: ModelVersion) -> Dict[str, Any]:
+        """Convert a ModelVersion into a plain info dictionary."""
         return {
             "name": mv.name,
             "version": mv.version,
@@ -235,9 +308,12 @@ class ModelRegistry:
 
     def list_all_versions(self) -> List[Dict[str, Any]]:
         """List all versions of the model."""
-        versions = []
-        for mv in self.client.search_model_versions(f"name = '{self.model_name}'"):
-            versions.append(self.get_version_info(mv.version))
+        # search_model_versions already returns fully populated versions,
+        # so no per-version get_model_version round trip is needed
+        versions = [
+            self._version_to_dict(mv)
+            for mv in self.client.search_model_versions(self._name_filter)
+        ]
 
         return sorted(versions, key=lambda x: x["created_at"], reverse=True)
 
@@ -262,11 +338,12 @@ def register_model(
     """
     registry = ModelRegistry(model_name=model_name)
 
-    # Register model
+    # Register model (one timestamp shared by description and tag)
+    trained_at = datetime.utcnow().isoformat()
     model_version = registry.register_version(
         model_uri=model_uri,
-        description=f"Recommendation model trained at {datetime.utcnow().isoformat()}",
-        tags={"trained_at": datetime.utcnow().isoformat()},
+        description=f"Recommendation model trained at {trained_at}",
+        tags={"trained_at": trained_at},
     )
 
     result = {
@@ -275,8 +352,9 @@ def register_model(
         "stage": model_version.current_stage,
     }
 
-    # Optionally promote
+    # Optionally promote (once the version has finished registering)
     if promote:
+        registry.wait_for_ready(model_version.version)
         if target_stage == "Production":
             registry.promote_to_production(model_version.version)
         else:
@@ -20,6 +20,8 @@ Why LightGBM?
 - Well-suited for recommendation tasks
 """
 
+import gc
+import hashlib
 import logging
 import os
 import sys
@@ -33,7 +35,6 @@ import mlflow
 import mlflow.lightgbm
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -47,6 +48,31 @@ except ImportError:
         mlflow_experiment_name = "recommender-system"
     settings = Settings()
 
+try:
+    import pyarrow  # noqa: F401  (optional: multithreaded CSV parsing)
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+try:
+    import optuna  # optional: hyperparameter search in RecommendationModelTrainer.tune
+    try:
+        from optuna_integration import LightGBMPruningCallback
+    except ImportError:
+        from optuna.integration import LightGBMPruningCallback
+    OPTUNA_AVAILABLE = True
+except ImportError:
+    OPTUNA_AVAILABLE = False
+
+try:
+    # optional: multithreaded concat/join when preparing training data
+    # (pl.from_pandas needs pyarrow for string columns)
+    import polars as pl
+    import pyarrow  # noqa: F401
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -69,11 +95,15 @@ class TrainingConfig:
     colsample_bytree: float = 0.8
     reg_alpha: float = 0.1
     reg_lambda: float = 0.1
+    max_bin: int = 63  # Histogram bins per feature (LightGBM default is 255)
+    use_gpu: bool = False  # CUDA tree learner; falls back to CPU if unavailable
 
     # Training settings
     test_size: float = 0.2
     random_state: int = 42
     early_stopping_rounds: int = 50
+    n_tuning_trials: int = 0  # Optuna trials before the final fit (0 = no tuning)
+    dataset_cache_dir: Optional[str] = None  # Reuse prepared matrices and binned datasets across runs
 
     # Feature settings
     negative_sampling_ratio: float = 5.0  # Ratio of negative to positive samples
@@ -99,6 +129,8 @@ class RecommendationDataset:
         interactions_path: Optional[str] = None,
         user_features_path: Optional[str] = None,
         item_features_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        random_state: int = 42,
     ):
         """
         Initialize dataset.
@@ -107,14 +139,24 @@ class RecommendationDataset:
             interactions_path: Path to user-item interactions CSV
             user_features_path: Path to user features CSV
             item_features_path: Path to item features CSV
+            cache_dir: Directory for cached prepared matrices (None disables caching)
+            random_state: Seed for positive/negative sampling and the train/val split
         """
         self.interactions_path = interactions_path
         self.user_features_path = user_features_path
         self.item_features_path = item_features_path
+        self.cache_dir = cache_dir
+        self.random_state = random_state
+
+        # Resolve input files once; missing or empty files fall back to synthetic data
+        self._interactions_file = self._resolve_input(interactions_path)
+        self._user_features_file = self._resolve_input(user_features_path)
+        self._item_features_file = self._resolve_input(item_features_path)
 
         self.interactions_df: Optional[pd.DataFrame] = None
         self.user_features_df: Optional[pd.DataFrame] = None
         self.item_features_df: Optional[pd.DataFrame] = None
+        self.feature_names: Optional[List[str]] = None
 
     def load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
@@ -126,8 +168,8 @@ class RecommendationDataset:
         logger.info("Loading training data...")
 
         # Load interactions
-        if self.interactions_path and Path(self.interactions_path).exists():
-            self.interactions_df = pd.read_csv(self.interactions_path)
+        if self._interactions_file is not None:
+            self.interactions_df = pd.read_csv(self._interactions_file, engine=CSV_ENGINE)
             logger.info(f"Loaded {len(self.interactions_df)} interactions")
         else:
             # Generate synthetic data for demonstration
@@ -135,34 +177,48 @@ class RecommendationDataset:
             logger.info(f"Generated {len(self.interactions_df)} synthetic interactions")
 
         # Load user features
-        if self.user_features_path and Path(self.user_features_path).exists():
-            self.user_features_df = pd.read_csv(self.user_features_path)
+        if self._user_features_file is not None:
+            self.user_features_df = pd.read_csv(self._user_features_file, engine=CSV_ENGINE)
             logger.info(f"Loaded {len(self.user_features_df)} user features")
         else:
             self.user_features_df = self._generate_synthetic_user_features()
 
         # Load item features
-        if self.item_features_path and Path(self.item_features_path).exists():
-            self.item_features_df = pd.read_csv(self.item_features_path)
+        if self._item_features_file is not None:
+            self.item_features_df = pd.read_csv(self._item_features_file, engine=CSV_ENGINE)
             logger.info(f"Loaded {len(self.item_features_df)} item features")
         else:
             self.item_features_df = self._generate_synthetic_item_features()
 
         return self.interactions_df, self.user_features_df, self.item_features_df
 
+    @staticmethod
+    def _resolve_input(path: Optional[str]) -> Optional[Path]:
+        """Path to a non-empty regular file, or None."""
+        if not path:
+            return None
+        path = Path(path)
+        try:
+            return path if path.is_file() and path.stat().st_size > 0 else None
+        except OSError:
+            return None
+
     def _generate_synthetic_interactions(self, n_users: int = 1000, n_items: int = 500, n_interactions: int = 50000) -> pd.DataFrame:
         """Generate synthetic interaction data."""
         np.random.seed(42)
 
-        users = np.random.choice([f"user_{i}" for i in range(n_users)], n_interactions)
-        items = np.random.choice([f"item_{i}" for i in range(n_items)], n_interactions)
+        # Draw integer codes and map them to ids through small lookup tables
+        user_codes = np.random.randint(0, n_users, n_interactions)
+        item_codes = np.random.randint(0, n_items, n_interactions)
+        users = np.array([f"user_{i}" for i in range(n_users)])[user_codes]
+        items = np.array([f"item_{i}" for i in range(n_items)])[item_codes]
 
         # Generate engagement scores (higher = more positive interaction)
         engagement = np.random.beta(2, 5, n_interactions)  # Skewed towards lower engagement
 
         # Add some structure: users have preferences
-        user_pref = np.array([hash(u) % 100 / 100 for u in users])
-        item_pop = np.array([hash(i) % 100 / 100 for i in items])
+        user_pref = (user_codes % 100) / 100
+        item_pop = (item_codes % 100) / 100
         engagement = (engagement + user_pref * 0.3 + item_pop * 0.2) / 1.5
 
         return pd.DataFrame({
@@ -174,31 +230,99 @@ class RecommendationDataset:
 
     def _generate_synthetic_user_features(self, n_users: int = 1000) -> pd.DataFrame:
         """Generate synthetic user features."""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
 
         users = [f"user_{i}" for i in range(n_users)]
 
-        return pd.DataFrame({
-            "user_id": users,
-            **{f"user_feature_{i}": np.random.randn(n_users) for i in range(20)},
-            "activity_level": np.random.beta(2, 5, n_users),
-            "account_age_days": np.random.exponential(100, n_users),
-            "session_count": np.random.poisson(10, n_users),
-        })
+        # All latent features in one 2D draw, wrapped as a single block
+        features = pd.DataFrame(
+            rng.standard_normal((n_users, 20), dtype=np.float32),
+            columns=[f"user_feature_{i}" for i in range(20)],
+        )
+        features.insert(0, "user_id", users)
+        features["activity_level"] = rng.beta(2, 5, n_users)
+        features["account_age_days"] = rng.exponential(100, n_users)
+        features["session_count"] = rng.poisson(10, n_users)
+
+        return features
 
     def _generate_synthetic_item_features(self, n_items: int = 500) -> pd.DataFrame:
         """Generate synthetic item features."""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
 
         items = [f"item_{i}" for i in range(n_items)]
 
-        return pd.DataFrame({
-            "item_id": items,
-            **{f"item_feature_{i}": np.random.randn(n_items) for i in range(10)},
-            "popularity_score": np.random.beta(2, 5, n_items),
-            "category_encoded": np.random.randint(0, 10, n_items),
-            "recency_score": np.random.beta(5, 2, n_items),
-        })
+        # All latent features in one 2D draw, wrapped as a single block
+        features = pd.DataFrame(
+            rng.standard_normal((n_items, 10), dtype=np.float32),
+            columns=[f"item_feature_{i}" for i in range(10)],
+        )
+        features.insert(0, "item_id", items)
+        features["popularity_score"] = rng.beta(2, 5, n_items)
+        features["category_encoded"] = rng.integers(0, 10, n_items)
+        features["recency_score"] = rng.beta(5, 2, n_items)
+
+        return features
+
+    @staticmethod
+    def _attach_features(df: pd.DataFrame, features: pd.DataFrame, key: str) -> pd.DataFrame:
+        """
+        Left-join feature columns onto df by key.
+
+        Each key is hashed once to a row position in the feature table and
+        the feature block is gathered positionally; unknown keys get NaN
+        rows, as with merge(how="left"). Feature keys must be unique.
+        """
+        positions = pd.Index(features[key]).get_indexer(df[key])
+        block = features.drop(columns=key).reset_index(drop=True).reindex(positions)
+        block.index = df.index
+        return pd.concat([df, block], axis=1)
+
+    def _feature_matrix(
+        self, positive_samples: pd.DataFrame, negative_df: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Concatenate samples, join features and return (X, y, feature_cols)."""
+        train_df = pd.concat([positive_samples, negative_df], ignore_index=True)
+
+        # Attach features (left join on user_id, then item_id)
+        train_df = self._attach_features(train_df, self.user_features_df, "user_id")
+        train_df = self._attach_features(train_df, self.item_features_df, "item_id")
+
+        # Drop identifiers
+        feature_cols = [c for c in train_df.columns if c not in ["user_id", "item_id", "timestamp"]]
+
+        # float32, C-contiguous: the layout LightGBM bins from without converting
+        # (NaNs from unmatched joins are zeroed in place on the array rather
+        # than through a fillna copy of the frame)
+        X = np.ascontiguousarray(train_df[feature_cols].to_numpy(dtype=np.float32))
+        np.nan_to_num(X, copy=False, nan=0.0, posinf=np.inf, neginf=-np.inf)
+        y = train_df["engagement"].to_numpy(dtype=np.float32, na_value=0.0)
+        return X, y, feature_cols
+
+    def _feature_matrix_polars(
+        self, positive_samples: pd.DataFrame, negative_df: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Same as _feature_matrix, as one lazy Polars query.
+
+        The concat and both hash joins run multithreaded on Arrow columns;
+        only the final float32 matrix is materialized.
+        """
+        samples = pl.concat(
+            [pl.from_pandas(positive_samples).lazy(), pl.from_pandas(negative_df).lazy()],
+            how="diagonal_relaxed",
+        )
+        joined = (
+            samples
+            .join(pl.from_pandas(self.user_features_df).lazy(), on="user_id", how="left", maintain_order="left")
+            .join(pl.from_pandas(self.item_features_df).lazy(), on="item_id", how="left", maintain_order="left")
+            .drop(["user_id", "item_id", "timestamp"], strict=False)
+        )
+        df = joined.select(pl.all().cast(pl.Float32).fill_null(0).fill_nan(0)).collect()
+
+        X = df.to_numpy(order="c")
+        y = df.get_column("engagement").to_numpy()
+        return X, y, df.columns
 
     def prepare_training_data(
         self,
@@ -215,6 +339,20 @@ class RecommendationDataset:
         Returns:
             Tuple of (X_train, X_val, y_train, y_val) arrays
         """
+        # Identical inputs and settings were prepared before: skip loading,
+        # sampling and joining entirely
+        cache_path = self._prepared_cache_path(negative_sampling_ratio)
+        if cache_path is not None and cache_path.exists():
+            with np.load(cache_path) as cached:
+                self.feature_names = cached["feature_names"].tolist()
+                X_train, X_val = cached["X_train"], cached["X_val"]
+                y_train, y_val = cached["y_train"], cached["y_val"]
+            logger.info(
+                f"Loaded prepared training data from {cache_path}: "
+                f"{len(X_train)} train, {len(X_val)} val samples"
+            )
+            return X_train, X_val, y_train, y_val
+
         # Ensure data is loaded
         if self.interactions_df is None:
             self.load_data()
@@ -224,71 +362,122 @@ class RecommendationDataset:
             self.interactions_df["engagement"] > 0.3
         ].copy()
 
-        # Create negative samples (non-interactions) - OPTIMIZED
-        all_items = list(self.item_features_df["item_id"])
-        negative_samples = []
-        
-        # Group interactions by user for efficient lookup
-        user_items = self.interactions_df.groupby("user_id")["item_id"].apply(set).to_dict()
-        all_items_set = set(all_items)
-        
+        # Create negative samples (non-interactions), drawn in bulk
+        item_ids = self.item_features_df["item_id"].to_numpy()
+        n_items = len(item_ids)
+
+        # Integer-coded user -> item adjacency. Each user's item codes are
+        # sorted and offset by user_code * n_items, so one sorted int64 key
+        # array answers every membership query with a single searchsorted.
+        user_codes, user_index = pd.factorize(self.interactions_df["user_id"])
+        item_codes = pd.Index(item_ids).get_indexer(self.interactions_df["item_id"])
+        in_catalog = item_codes >= 0
+        interacted_keys = np.unique(
+            user_codes[in_catalog].astype(np.int64) * n_items + item_codes[in_catalog]
+        )
+
+        def interacted(users: np.ndarray, items: np.ndarray) -> np.ndarray:
+            """Mask of (user code, item code) pairs that already have an interaction."""
+            keys = users.astype(np.int64) * n_items + items
+            if len(interacted_keys) == 0:
+                return np.zeros(len(keys), dtype=bool)
+            pos = np.minimum(np.searchsorted(interacted_keys, keys), len(interacted_keys) - 1)
+            return interacted_keys[pos] == keys
+
         # Limit to first 1000 positive samples for faster training
         sample_limit = min(1000, len(positive_samples))
-        sampled_positive = positive_samples.sample(n=sample_limit, random_state=42)
+        sampled_positive = positive_samples.sample(n=sample_limit, random_state=self.random_state)
         
         logger.info(f"Sampling negatives for {sample_limit} positive samples...")
 
-        for _, row in sampled_positive.iterrows():
-            user = row["user_id"]
-            interacted_items = user_items.get(user, set())
-
-            # Sample negative items
-            non_interacted = list(all_items_set - interacted_items)
-            n_neg = min(
-                int(negative_sampling_ratio),
-                len(non_interacted)
-            )
-            if n_neg > 0:
-                sampled_neg = np.random.choice(non_interacted, n_neg, replace=False)
-
-                for item in sampled_neg:
-                    negative_samples.append({
-                        "user_id": user,
-                        "item_id": item,
-                        "engagement": 0.0,
-                    })
-
-        negative_df = pd.DataFrame(negative_samples)
+        # One candidate item per (positive, slot), then redraw only the
+        # candidates the user has already interacted with. Drawn from a
+        # seeded generator so the draw (and the cache keyed on it) is reproducible
+        rng = np.random.default_rng(self.random_state)
+        n_neg = int(negative_sampling_ratio) if n_items > 0 else 0
+        neg_users = np.repeat(user_index.get_indexer(sampled_positive["user_id"]), n_neg)
+        neg_items = rng.integers(0, max(n_items, 1), size=neg_users.size)
+
+        redraw = np.flatnonzero(interacted(neg_users, neg_items))
+        for _ in range(10):
+            if redraw.size == 0:
+                break
+            neg_items[redraw] = rng.integers(0, n_items, size=redraw.size)
+            redraw = redraw[interacted(neg_users[redraw], neg_items[redraw])]
+
+        # Drop what still collides (users who interacted with nearly every item)
+        if redraw.size:
+            keep = np.ones(neg_users.size, dtype=bool)
+            keep[redraw] = False
+            neg_users, neg_items = neg_users[keep], neg_items[keep]
+
+        # Typed columns of known length, handed over without a copy
+        negative_df = pd.DataFrame(
+            {
+                "user_id": user_index.to_numpy()[neg_users],
+                "item_id": item_ids[neg_items],
+                "engagement": np.zeros(neg_users.size),
+            },
+            copy=False,
+        )
         logger.info(f"Generated {len(negative_df)} negative samples")
 
-        # Combine positive and negative samples
-        train_df = pd.concat([positive_samples, negative_df], ignore_index=True)
+        # Combine positive and negative samples and attach features
+        build_matrix = self._feature_matrix_polars if POLARS_AVAILABLE else self._feature_matrix
+        X, y, feature_cols = build_matrix(positive_samples, negative_df)
+        self.feature_names = feature_cols
 
-        # Merge with features
-        train_df = train_df.merge(
-            self.user_features_df, on="user_id", how="left"
-        ).merge(
-            self.item_features_df, on="item_id", how="left"
-        )
+        # Split data: one shuffled permutation, 20% held out for validation
+        order = np.random.default_rng(self.random_state).permutation(len(X))
+        n_val = int(np.ceil(len(X) * 0.2))
+        train_idx, val_idx = order[n_val:], order[:n_val]
+        # Fancy indexing already yields fresh C-contiguous copies
+        X_train, X_val = X[train_idx], X[val_idx]
+        y_train, y_val = y[train_idx], y[val_idx]
 
-        # Drop identifiers
-        feature_cols = [c for c in train_df.columns if c not in ["user_id", "item_id", "timestamp"]]
-        X = train_df[feature_cols].fillna(0).values
-        y = train_df["engagement"].values
-
-        # Split data
-        X_train, X_val, y_train, y_val = train_test_split(
-            X, y,
-            test_size=0.2,
-            random_state=42,
-        )
+        # Drop the joined frame and sampling intermediates so LightGBM's
+        # bin-mapper construction doesn't run on top of them
+        del positive_samples, sampled_positive, negative_df, X, y
+        gc.collect()
 
         logger.info(
             f"Prepared training data: {len(X_train)} train, {len(X_val)} val samples"
         )
 
+        if cache_path is not None:
+            # Write then rename so an interrupted run never leaves a partial cache
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp.npz")
+            np.savez(
+                tmp_path,
+                X_train=X_train, X_val=X_val, y_train=y_train, y_val=y_val,
+                feature_names=np.array(feature_cols),
+            )
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Cached prepared training data at {cache_path}")
+
         return X_train, X_val, y_train, y_val
 
+    def _prepared_cache_path(self, negative_sampling_ratio: float) -> Optional[Path]:
+        """
+        Cache file for prepared matrices, or None if caching is off.
+
+        Keyed on the sampling ratio, the seed and each input file's path,
+        size and mtime (synthetic inputs key on their absence).
+        """
+        if not self.cache_dir:
+            return None
+
+        key = [str(negative_sampling_ratio), f"seed={self.random_state}"]
+        for path in (self._interactions_file, self._user_features_file, self._item_features_file):
+            if path is not None:
+                stat = path.stat()
+                key.append(f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}")
+            else:
+                key.append("synthetic")
+        digest = hashlib.blake2b("|".join(key).encode(), digest_size=8).hexdigest()
+        return Path(self.cache_dir) / f"prepared_{digest}.npz"
+
 
 class RecommendationModelTrainer:
     """
@@ -313,19 +502,67 @@ class RecommendationModelTrainer:
         self.model: Optional[lgb.LGBMModel] = None
         self.feature_names: Optional[List[str]] = None
 
-    def train(
+        # Constructed (binned) Datasets from prepare(), reused by train()/tune()
+        self._train_data: Optional[lgb.Dataset] = None
+        self._val_data: Optional[lgb.Dataset] = None
+
+    def prepare(
         self,
         X_train: np.ndarray,
         X_val: np.ndarray,
         y_train: np.ndarray,
         y_val: np.ndarray,
         feature_names: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Bin the training and validation data once.
+
+        The Datasets are constructed eagerly and kept on the trainer, so
+        tune() and train() called without arrays reuse the same bin
+        mappers instead of re-binning for every fit.
+
+        Args:
+            X_train: Training features
+            X_val: Validation features
+            y_train: Training labels
+            y_val: Validation labels
+            feature_names: Names of features
+        """
+        train_data, val_data = self._build_datasets(
+            X_train, X_val, y_train, y_val, feature_names
+        )
+        self._train_data = train_data.construct()
+        self._val_data = val_data.construct()
+        self.feature_names = feature_names or [f"feature_{i}" for i in range(X_train.shape[1])]
+
+    def _prepared_datasets(
+        self,
+        X_train: Optional[np.ndarray],
+        X_val: Optional[np.ndarray],
+        y_train: Optional[np.ndarray],
+        y_val: Optional[np.ndarray],
+        feature_names: Optional[List[str]],
+    ) -> Tuple[lgb.Dataset, lgb.Dataset]:
+        """Datasets for a fit: re-prepared from arrays if given, else the cached ones."""
+        if X_train is not None:
+            self.prepare(X_train, X_val, y_train, y_val, feature_names)
+        elif self._train_data is None:
+            raise ValueError("No training data. Pass arrays or call prepare() first.")
+        return self._train_data, self._val_data
+
+    def train(
+        self,
+        X_train: Optional[np.ndarray] = None,
+        X_val: Optional[np.ndarray] = None,
+        y_train: Optional[np.ndarray] = None,
+        y_val: Optional[np.ndarray] = None,
+        feature_names: Optional[List[str]] = None,
     ) -> lgb.LGBMModel:
         """
         Train the recommendation model.
 
         Args:
-            X_train: Training features
+            X_train: Training features (omit to reuse the prepare() Datasets)
             X_val: Validation features
             y_train: Training labels
             y_val: Validation labels
@@ -333,15 +570,88 @@ class RecommendationModelTrainer:
 
         Returns:
             Trained LightGBM model
+
+        Raises:
+            ValueError: If no arrays are given and prepare() was not called
         """
         logger.info("Starting model training...")
 
-        # Create LightGBM datasets
-        train_data = lgb.Dataset(X_train, label=y_train)
-        val_data = lgb.Dataset(X_val, label=y_val, reference=train_data)
+        train_data, val_data = self._prepared_datasets(
+            X_train, X_val, y_train, y_val, feature_names
+        )
+        params = self._model_params()
+
+        # Train model with early stopping
+        self.model = self._train_booster(
+            params,
+            train_data,
+            num_boost_round=self.config.n_estimators,
+            valid_sets=[train_data, val_data],
+            valid_names=["train", "valid"],
+            callbacks=[
+                lgb.early_stopping(self.config.early_stopping_rounds),
+                lgb.log_evaluation(100),
+            ],
+        )
+
+        logger.info(f"Training completed. Best iteration: {self.model.best_iteration}")
+
+        return self.model
 
-        # Model parameters
-        params = {
+    def _build_datasets(
+        self,
+        X_train: np.ndarray,
+        X_val: np.ndarray,
+        y_train: np.ndarray,
+        y_val: np.ndarray,
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[lgb.Dataset, lgb.Dataset]:
+        """Training and validation Datasets sharing one set of bin mappers."""
+        # Binning parameters: fewer bins keep per-leaf histograms small
+        dataset_params = {
+            "max_bin": self.config.max_bin,
+            "min_data_in_bin": 5,
+            "feature_pre_filter": False,
+            "verbosity": -1,
+        }
+
+        # Create LightGBM datasets; the binned training set is loaded from
+        # the on-disk cache when an identical matrix was binned before
+        categorical = (
+            ["category_encoded"]
+            if feature_names and "category_encoded" in feature_names
+            else "auto"
+        )
+        cache_path = self._dataset_cache_path(X_train, y_train, feature_names, dataset_params)
+        if cache_path is not None and cache_path.exists():
+            logger.info(f"Loading binned training dataset from {cache_path}")
+            train_data = lgb.Dataset(str(cache_path), params=dataset_params, free_raw_data=True)
+        else:
+            train_data = lgb.Dataset(
+                X_train,
+                label=y_train,
+                feature_name=feature_names or "auto",
+                categorical_feature=categorical,
+                params=dataset_params,
+                free_raw_data=True,
+            )
+            if cache_path is not None:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                train_data.save_binary(str(cache_path))
+        val_data = lgb.Dataset(
+            X_val,
+            label=y_val,
+            reference=train_data,
+            feature_name=feature_names or "auto",
+            categorical_feature=train_data.categorical_feature,
+            params=dataset_params,
+            free_raw_data=True,
+        )
+        return train_data, val_data
+
+    def _model_params(self) -> Dict[str, Any]:
+        """LightGBM booster parameters from the training config."""
+        return {
             "objective": "regression",
             "metric": "rmse",
             "boosting_type": "gbdt",
@@ -356,26 +666,136 @@ class RecommendationModelTrainer:
             "random_state": self.config.random_state,
             "verbosity": -1,
             "n_jobs": -1,
+            "histogram_pool_size": 1024,  # MB; bounds cached histogram memory
+            **(
+                {"device_type": "cuda", "gpu_use_dp": False}
+                if self.config.use_gpu
+                else {}
+            ),
         }
 
-        # Train model with early stopping
-        self.model = lgb.train(
-            params,
-            train_data,
-            num_boost_round=self.config.n_estimators,
-            valid_sets=[train_data, val_data],
-            valid_names=["train", "valid"],
-            callbacks=[
-                lgb.early_stopping(self.config.early_stopping_rounds),
-                lgb.log_evaluation(100),
-            ],
+    def _train_booster(self, params: Dict[str, Any], train_data: lgb.Dataset, **kwargs) -> lgb.Booster:
+        """
+        lgb.train with a CPU fallback.
+
+        If the GPU learner can't start (LightGBM built without CUDA, no
+        device), training is retried on CPU and use_gpu is switched off so
+        later fits don't try again.
+        """
+        try:
+            return lgb.train(params, train_data, **kwargs)
+        except lgb.basic.LightGBMError as e:
+            if "device_type" not in params:
+                raise
+            logger.warning(f"GPU training unavailable ({e}); falling back to CPU")
+            self.config.use_gpu = False
+            cpu_params = {k: v for k, v in params.items() if k not in ("device_type", "gpu_use_dp")}
+            return lgb.train(cpu_params, train_data, **kwargs)
+
+    def tune(
+        self,
+        X_train: Optional[np.ndarray] = None,
+        X_val: Optional[np.ndarray] = None,
+        y_train: Optional[np.ndarray] = None,
+        y_val: Optional[np.ndarray] = None,
+        feature_names: Optional[List[str]] = None,
+        n_trials: int = 30,
+    ) -> Dict[str, Any]:
+        """
+        Search hyperparameters with Optuna.
+
+        Uses a seeded TPE sampler; each trial reports validation RMSE per
+        boosting round so unpromising trials are pruned early. The best
+        parameters are written back to the config (so a following train()
+        uses them) and logged to the active MLflow run, if any.
+
+        Args:
+            X_train: Training features (omit to reuse the prepare() Datasets)
+            X_val: Validation features
+            y_train: Training labels
+            y_val: Validation labels
+            feature_names: Names of features
+            n_trials: Number of Optuna trials
+
+        Returns:
+            Best hyperparameters found
+
+        Raises:
+            ImportError: If optuna is not installed
+            ValueError: If no arrays are given and prepare() was not called
+        """
+        if not OPTUNA_AVAILABLE:
+            raise ImportError("optuna is required for hyperparameter tuning")
+
+        logger.info(f"Tuning hyperparameters over {n_trials} trials...")
+
+        # Bin once; every trial trains on the same Datasets
+        train_data, val_data = self._prepared_datasets(
+            X_train, X_val, y_train, y_val, feature_names
         )
 
-        self.feature_names = feature_names or [f"feature_{i}" for i in range(X_train.shape[1])]
+        def objective(trial: "optuna.Trial") -> float:
+            params = {
+                **self._model_params(),
+                "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
+                "num_leaves": trial.suggest_int("num_leaves", 16, 256, log=True),
+                "max_depth": trial.suggest_int("max_depth", 3, 12),
+                "min_child_samples": trial.suggest_int("min_child_samples", 5, 100, log=True),
+                "subsample": trial.suggest_float("subsample", 0.5, 1.0),
+                "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
+                "reg_alpha": trial.suggest_float("reg_alpha", 1e-3, 10.0, log=True),
+                "reg_lambda": trial.suggest_float("reg_lambda", 1e-3, 10.0, log=True),
+            }
+            booster = self._train_booster(
+                params,
+                train_data,
+                num_boost_round=self.config.n_estimators,
+                valid_sets=[val_data],
+                valid_names=["valid"],
+                callbacks=[
+                    lgb.early_stopping(self.config.early_stopping_rounds, verbose=False),
+                    LightGBMPruningCallback(trial, "rmse", valid_name="valid"),
+                ],
+            )
+            return booster.best_score["valid"]["rmse"]
 
-        logger.info(f"Training completed. Best iteration: {self.model.best_iteration}")
+        study = optuna.create_study(
+            direction="minimize",
+            sampler=optuna.samplers.TPESampler(seed=self.config.random_state),
+            pruner=optuna.pruners.MedianPruner(n_warmup_steps=10),
+        )
+        study.optimize(objective, n_trials=n_trials)
 
-        return self.model
+        for name, value in study.best_params.items():
+            setattr(self.config, name, value)
+        logger.info(f"Best validation RMSE {study.best_value:.4f} with {study.best_params}")
+
+        if mlflow.active_run() is not None:
+            try:
+                mlflow.log_params({f"tuned.{k}": v for k, v in study.best_params.items()})
+                mlflow.log_metric("tuning_best_rmse", study.best_value)
+            except Exception as e:
+                logger.warning(f"Failed to log tuning results: {e}")
+
+        return study.best_params
+
+    def _dataset_cache_path(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        feature_names: Optional[List[str]],
+        dataset_params: Dict[str, Any],
+    ) -> Optional[Path]:
+        """Binary Dataset cache file for exactly this matrix, or None if caching is off."""
+        if not self.config.dataset_cache_dir:
+            return None
+
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(X))
+        digest.update(np.ascontiguousarray(y))
+        digest.update(",".join(feature_names or []).encode())
+        digest.update(repr(sorted(dataset_params.items())).encode())
+        return Path(self.config.dataset_cache_dir) / f"train_{digest.hexdigest()[:16]}.bin"
 
     def evaluate(
         self,
@@ -435,25 +855,36 @@ class RecommendationModelTrainer:
 
         # Convert to binary relevance
         relevance_threshold = 0.5
-        y_binary = (y_true >= relevance_threshold).astype(int)
+        y_binary = y_true >= relevance_threshold  # bool mask, 1 byte per item
 
-        # Sort by predicted score (descending)
-        sorted_indices = np.argsort(y_pred)[::-1]
+        total_relevant = int(np.count_nonzero(y_binary))
+
+        # Rank only the top max(K) predictions (descending): partition,
+        # then sort that slice
+        k_max = min(max(k_values), len(y_pred))
+        if 0 < k_max < len(y_pred):
+            top_indices = np.argpartition(-y_pred, k_max - 1)[:k_max]
+        else:
+            top_indices = np.arange(len(y_pred))
+        top_indices = top_indices[np.argsort(-y_pred[top_indices], kind="stable")][:k_max]
+
+        # Cumulative relevance and precision over the largest K, computed
+        # once; each K below is a slice/lookup into these
+        top_relevance = y_binary[top_indices]
+        cum_relevance = np.cumsum(top_relevance, dtype=np.int32)
+        ap_terms = np.cumsum(cum_relevance / np.arange(1, k_max + 1) * top_relevance)
 
         # Calculate metrics for each K
         for k in k_values:
-            top_k_indices = sorted_indices[:k]
-            top_k_relevance = y_binary[top_k_indices]
+            n = min(k, k_max)
 
             # Recall@K: What fraction of relevant items are in top-K?
-            total_relevant = np.sum(y_binary)
-            relevant_in_top_k = np.sum(top_k_relevance)
+            relevant_in_top_k = cum_relevance[n - 1] if n > 0 else 0
             recall_k = relevant_in_top_k / total_relevant if total_relevant > 0 else 0
             metrics[f"recall@{k}"] = recall_k
 
             # Average Precision@K
-            precision_at_k = np.cumsum(top_k_relevance) / np.arange(1, k + 1)
-            ap_k = np.sum(precision_at_k * top_k_relevance) / np.sum(y_binary) if np.sum(y_binary) > 0 else 0
+            ap_k = ap_terms[n - 1] / total_relevant if total_relevant > 0 and n > 0 else 0
             metrics[f"map@{k}"] = ap_k
 
         # CTR proxy (average predicted engagement)
@@ -537,15 +968,35 @@ def train_model(
 
         # Load and prepare data
         logger.info("Preparing training dataset...")
-        dataset = RecommendationDataset()
+        dataset = RecommendationDataset(
+            cache_dir=config.dataset_cache_dir,
+            random_state=config.random_state,
+        )
         X_train, X_val, y_train, y_val = dataset.prepare_training_data(
             negative_sampling_ratio=config.negative_sampling_ratio,
         )
 
+        trainer = RecommendationModelTrainer(config)
+
+        # Bin once; tuning trials and the final fit share these Datasets
+        trainer.prepare(
+            X_train, X_val, y_train, y_val,
+            feature_names=dataset.feature_names,
+        )
+        # The binned Dataset owns the training data now; only X_val is needed below
+        del X_train, y_train
+        gc.collect()
+
+        # Optional hyperparameter search; best values land in config
+        if config.n_tuning_trials > 0:
+            if OPTUNA_AVAILABLE:
+                trainer.tune(n_trials=config.n_tuning_trials)
+            else:
+                logger.warning("optuna not installed; training with configured hyperparameters")
+
         # Train model
         logger.info("Training model...")
-        trainer = RecommendationModelTrainer(config)
-        model = trainer.train(X_train, X_val, y_train, y_val)
+        model = trainer.train()
 
         # Evaluate model
         logger.info("Evaluating model...")
@@ -46,7 +46,7 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
 # Add parent directory to path to import from backend
@@ -54,6 +54,12 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv  # optional: multithreaded CSV parsing
+except ImportError:
+    pacsv = None
+
 # ML libraries
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
@@ -74,6 +80,125 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Narrow dtypes for the processed MovieLens columns (absent columns are ignored)
+CSV_COLUMN_TYPES = {
+    'user_id': 'int32',
+    'item_id': 'int32',
+    'rating': 'float32',
+    'engagement': 'float32',
+}
+
+# Catalogs at least this large get a compressed IVF-PQ index; smaller ones
+# stay on exact flat search, which is already fast and needs no training
+IVFPQ_MIN_ITEMS = 50_000
+
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    """Read a processed CSV, with pyarrow's multithreaded reader when available."""
+    if pacsv is None:
+        return pd.read_csv(path)
+    
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 22),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.type_for_alias(t) for name, t in CSV_COLUMN_TYPES.items()}
+            ),
+        )
+    except pa.ArrowInvalid:
+        # Ids that aren't integers: let pandas infer the types
+        return pd.read_csv(path)
+    return table.to_pandas()
+
+
+def _temporal_split(
+    interactions: pd.DataFrame,
+    test_fraction: float = 0.2
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split interactions into train/test in memory.
+    
+    Mirrors the temporal split data/download_dataset.py writes to
+    train.csv/test.csv (oldest 80% train, newest 20% test), so the
+    pipeline doesn't have to parse the same rows again from disk. Without
+    a timestamp column, falls back to a seeded random split.
+    """
+    if 'timestamp' not in interactions.columns:
+        return train_test_split(interactions, test_size=test_fraction, random_state=42)
+    
+    interactions_sorted = interactions.sort_values('timestamp')
+    split_idx = int(len(interactions_sorted) * (1 - test_fraction))
+    return interactions_sorted.iloc[:split_idx], interactions_sorted.iloc[split_idx:]
+
+
+# Interned str forms of small non-negative integer ids, shared by every
+# _str_ids call so all stages reuse the same str objects
+_ID_STR_TABLE = np.empty(0, dtype=object)
+ID_STR_TABLE_MAX = 1 << 21
+
+
+def _id_str_table(max_id: int) -> np.ndarray:
+    """Return the interned id -> str table, grown to cover max_id."""
+    global _ID_STR_TABLE
+    if len(_ID_STR_TABLE) <= max_id:
+        extra = np.array(
+            [str(i) for i in range(len(_ID_STR_TABLE), max_id + 1)], dtype=object
+        )
+        _ID_STR_TABLE = np.concatenate([_ID_STR_TABLE, extra])
+    return _ID_STR_TABLE
+
+
+def _str_ids(ids: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """
+    Object array of str ids, same values as ids.astype(str).
+
+    Each distinct id is converted once and rows share the resulting str
+    objects, instead of allocating a new string per row. Small integer ids
+    are looked up in a table shared across calls.
+    """
+    values = ids.to_numpy() if isinstance(ids, pd.Series) else np.asarray(ids)
+    if values.dtype.kind in "iu" and len(values):
+        low, high = int(values.min()), int(values.max())
+        if low >= 0 and high < ID_STR_TABLE_MAX:
+            return _id_str_table(high)[values]
+    
+    codes, uniques = pd.factorize(ids, use_na_sentinel=False)
+    labels = np.array([str(u) for u in uniques], dtype=object)
+    return labels[codes]
+
+
+def _ranking_metrics_at_k(
+    hits: np.ndarray,
+    n_recommended: np.ndarray,
+    n_relevant: np.ndarray,
+    k: int = 10
+) -> Dict[str, np.ndarray]:
+    """
+    Per-user Precision@K, Recall@K and AP@K for a whole batch of users.
+
+    Args:
+        hits: (n_users, k) bool matrix, True where the i-th recommendation
+            is relevant (padding columns past a user's list are False)
+        n_recommended: Number of recommendations per user
+        n_relevant: Number of relevant items per user (all > 0)
+        k: List length
+
+    Returns:
+        Dictionary of per-user 'precision', 'recall' and 'ap' arrays
+    """
+    n_hits = hits.sum(axis=1)
+    cum_hits = np.cumsum(hits, axis=1)
+    ap = (cum_hits / np.arange(1, k + 1) * hits).sum(axis=1)
+    return {
+        'precision': np.divide(
+            n_hits, n_recommended,
+            out=np.zeros(len(n_hits)), where=n_recommended > 0
+        ),
+        'recall': n_hits / n_relevant,
+        'ap': ap / np.minimum(n_relevant, k),
+    }
+
 
 class RecommenderTrainingPipeline:
     """Complete training pipeline for recommendation system."""
@@ -99,9 +224,9 @@ class RecommenderTrainingPipeline:
         """Load processed dataset."""
         logger.info("Loading dataset...")
         
-        interactions = pd.read_csv(self.data_dir / "interactions.csv")
-        users = pd.read_csv(self.data_dir / "users.csv")
-        items = pd.read_csv(self.data_dir / "items.csv")
+        interactions = _read_csv(self.data_dir / "interactions.csv")
+        users = _read_csv(self.data_dir / "users.csv")
+        items = _read_csv(self.data_dir / "items.csv")
         
         logger.info(f"Loaded {len(interactions)} interactions, "
                    f"{len(users)} users, {len(items)} items")
@@ -123,19 +248,21 @@ class RecommenderTrainingPipeline:
         """
         logger.info("Training Matrix Factorization model...")
         
-        # Convert IDs to strings for consistency
-        user_ids = interactions['user_id'].astype(str).tolist()
-        item_ids = interactions['item_id'].astype(str).tolist()
+        # Raw id arrays; the model keys them by their str form, converting
+        # each distinct id only once
+        user_ids = interactions['user_id'].to_numpy()
+        item_ids = interactions['item_id'].to_numpy()
         
         # Use engagement or rating as implicit feedback
         if 'engagement' in interactions.columns:
-            values = interactions['engagement'].tolist()
+            values = interactions['engagement'].to_numpy(dtype=np.float32)
         elif 'rating' in interactions.columns:
             # Convert ratings to implicit feedback (higher weight for better ratings)
-            values = (interactions['rating'] / interactions['rating'].max()).tolist()
+            ratings = interactions['rating'].to_numpy(dtype=np.float32)
+            values = ratings / ratings.max()
         else:
             # Binary feedback
-            values = [1.0] * len(interactions)
+            values = np.ones(len(interactions), dtype=np.float32)
         
         # Initialize and train model
         model = MatrixFactorizationModel(
@@ -153,7 +280,10 @@ class RecommenderTrainingPipeline:
     
     def evaluate_model(
         self,
-        test_interactions: pd.DataFrame
+        test_interactions: pd.DataFrame,
+        max_users: Optional[int] = None,
+        batch_size: int = 1024,
+        seed: int = 42
     ) -> Dict[str, float]:
         """
         Evaluate model on test set.
@@ -166,6 +296,9 @@ class RecommenderTrainingPipeline:
         
         Args:
             test_interactions: Test set DataFrame
+            max_users: Evaluate a uniform random sample of N test users (None = all)
+            batch_size: Users scored per batched recommendation call
+            seed: Seed for the max_users sample
             
         Returns:
             Dictionary of metrics
@@ -176,65 +309,76 @@ class RecommenderTrainingPipeline:
             logger.warning("Model not trained")
             return {}
         
-        # Prepare test data
-        test_user_ids = test_interactions['user_id'].astype(str).unique()
-        
-        # Metrics
-        precision_at_10_scores = []
-        recall_at_10_scores = []
-        map_scores = []
-        
-        for user_id in test_user_ids[:100]:  # Sample for speed
-            # Get ground truth items for this user
-            user_test = test_interactions[
-                test_interactions['user_id'].astype(str) == user_id
-            ]
-            
-            if len(user_test) == 0:
-                continue
-            
-            # Only consider items with high engagement/rating
-            if 'rating' in user_test.columns:
-                relevant_items = set(
-                    user_test[user_test['rating'] >= 4]['item_id'].astype(str)
-                )
-            else:
-                relevant_items = set(user_test['item_id'].astype(str))
-            
-            if len(relevant_items) == 0:
-                continue
-            
-            # Get recommendations
-            recommendations = self.model.recommend_for_user(user_id, n=10)
-            recommended_items = set([item_id for item_id, _ in recommendations])
-            
-            # Calculate metrics
-            hits = len(recommended_items & relevant_items)
-            
-            # Precision@10
-            precision = hits / len(recommended_items) if recommended_items else 0
-            precision_at_10_scores.append(precision)
-            
-            # Recall@10
-            recall = hits / len(relevant_items) if relevant_items else 0
-            recall_at_10_scores.append(recall)
-            
-            # Average Precision
-            ap = 0.0
-            hits_so_far = 0
-            for i, (item_id, _) in enumerate(recommendations):
-                if item_id in relevant_items:
-                    hits_so_far += 1
-                    ap += hits_so_far / (i + 1)
-            ap /= min(len(relevant_items), 10)
-            map_scores.append(ap)
-        
-        metrics = {
-            'precision@10': np.mean(precision_at_10_scores) if precision_at_10_scores else 0.0,
-            'recall@10': np.mean(recall_at_10_scores) if recall_at_10_scores else 0.0,
-            'map@10': np.mean(map_scores) if map_scores else 0.0,
-            'n_test_users': len(precision_at_10_scores),
-        }
+        # Prepare test data: ids converted once
+        user_keys = pd.Series(_str_ids(test_interactions['user_id']))
+        item_keys = pd.Series(_str_ids(test_interactions['item_id']))
+        test_user_ids = user_keys.unique()
+        if max_users is not None and max_users < len(test_user_ids):
+            # Reproducible uniform sample, kept in test order
+            rng = np.random.default_rng(seed)
+            sample_idx = rng.choice(len(test_user_ids), size=max_users, replace=False)
+            test_user_ids = test_user_ids[np.sort(sample_idx)]
+        
+        # Only consider items with high engagement/rating
+        if 'rating' in test_interactions.columns:
+            is_relevant = test_interactions['rating'].to_numpy() >= 4
+            user_keys, item_keys = user_keys[is_relevant], item_keys[is_relevant]
+        
+        # Users with at least one relevant item, in test order
+        k = 10
+        eval_users = pd.Index(test_user_ids[pd.Index(test_user_ids).isin(user_keys)])
+        eval_user_ids = eval_users.tolist()
+        
+        # Recommendations from batched scoring, batch_size users at a time
+        recommendations = []
+        for start in range(0, len(eval_user_ids), batch_size):
+            recommendations.extend(
+                self.model.recommend_for_users(eval_user_ids[start:start + batch_size], n=k)
+            )
+        
+        n_recommended = np.fromiter(
+            (len(recommended_ids) for recommended_ids, _ in recommendations),
+            dtype=np.int64, count=len(recommendations)
+        )
+        recommended_items = (
+            np.concatenate([recommended_ids for recommended_ids, _ in recommendations])
+            if recommendations else np.empty(0, dtype=object)
+        )
+        rec_rows = np.repeat(np.arange(len(recommendations)), n_recommended)
+        row_starts = np.cumsum(n_recommended) - n_recommended
+        rec_pos = np.arange(len(rec_rows)) - np.repeat(row_starts, n_recommended)
+        
+        # (user row, item code) int64 keys shared by relevant and recommended
+        # items, so membership is one np.isin over the whole batch
+        rel_rows = eval_users.get_indexer(user_keys)
+        in_eval = rel_rows >= 0
+        item_codes, item_uniques = pd.factorize(
+            np.concatenate([item_keys.to_numpy()[in_eval], recommended_items])
+        )
+        n_codes = max(len(item_uniques), 1)
+        n_rel_pairs = int(in_eval.sum())
+        rel_keys = np.unique(rel_rows[in_eval].astype(np.int64) * n_codes + item_codes[:n_rel_pairs])
+        rec_keys = rec_rows.astype(np.int64) * n_codes + item_codes[n_rel_pairs:]
+        
+        hit_rows = np.zeros((len(eval_user_ids), k), dtype=bool)
+        hit_rows[rec_rows, rec_pos] = np.isin(rec_keys, rel_keys)
+        n_relevant = np.bincount(rel_keys // n_codes, minlength=len(eval_user_ids))
+        
+        if eval_user_ids:
+            scores = _ranking_metrics_at_k(hit_rows, n_recommended, n_relevant, k)
+            metrics = {
+                'precision@10': float(scores['precision'].mean()),
+                'recall@10': float(scores['recall'].mean()),
+                'map@10': float(scores['ap'].mean()),
+                'n_test_users': len(eval_user_ids),
+            }
+        else:
+            metrics = {
+                'precision@10': 0.0,
+                'recall@10': 0.0,
+                'map@10': 0.0,
+                'n_test_users': 0,
+            }
         
         logger.info(f"Evaluation metrics: {metrics}")
         return metrics
@@ -257,28 +401,31 @@ class RecommenderTrainingPipeline:
         if not self.model or not self.model.is_fitted:
             raise ValueError("Model not trained")
         
-        # Create vector store
-        vector_store = FAISSVectorStore(
-            embedding_dim=self.embedding_dim,
-            index_type="flat",
-            metric="ip"
-        )
-        
-        # Get item embeddings
-        item_ids = items['item_id'].astype(str).tolist()
-        embeddings_list = []
-        valid_item_ids = []
+        # Get item embeddings: one gather into a contiguous (n_items, dim) array
+        item_ids = _str_ids(items['item_id']).tolist()
         
-        for item_id in item_ids:
-            embedding = self.model.get_item_embedding(item_id)
-            if embedding is not None:
-                embeddings_list.append(embedding)
-                valid_item_ids.append(item_id)
-        
-        if embeddings_list:
-            embeddings_array = np.vstack(embeddings_list)
-            vector_store.add_items(valid_item_ids, embeddings_array)
-            logger.info(f"Added {len(valid_item_ids)} items to vector store")
+        # Create vector store
+        if len(item_ids) >= IVFPQ_MIN_ITEMS and self.embedding_dim % 8 == 0:
+            vector_store = FAISSVectorStore(
+                embedding_dim=self.embedding_dim,
+                index_type="ivfpq",
+                metric="ip",
+                nlist=int(4 * np.sqrt(len(item_ids))),
+                pq_m=8
+            )
+        else:
+            vector_store = FAISSVectorStore(
+                embedding_dim=self.embedding_dim,
+                index_type="flat",
+                metric="ip"
+            )
+        
+        if item_ids:
+            embeddings_array = np.ascontiguousarray(
+                self.model.get_item_embeddings(item_ids), dtype=np.float32
+            )
+            vector_store.add_items(item_ids, embeddings_array)
+            logger.info(f"Added {len(item_ids)} items to vector store")
         
         self.vector_store = vector_store
         return vector_store
@@ -306,33 +453,28 @@ class RecommenderTrainingPipeline:
                 logger.warning("Redis not available, skipping population")
                 return
             
-            # Store user embeddings
-            user_ids = users['user_id'].astype(str).unique()
-            for user_id in user_ids[:1000]:  # Limit for demo
-                embedding = self.model.get_user_embedding(user_id)
-                if embedding is not None:
-                    feature_store.set_user_embedding(user_id, embedding.astype(np.float32))
+            # Store user embeddings (pipelined, float16 on the wire)
+            # Dedupe the raw id column, then convert only the ids we keep
+            user_ids = _str_ids(pd.unique(users['user_id'].to_numpy())[:1000])  # Limit for demo
+            user_embeddings = self.model.get_user_embeddings(user_ids).astype(np.float32, copy=False)
+            feature_store.set_embeddings_bulk(list(zip(user_ids, user_embeddings)), entity="user")
             
             # Store item embeddings
-            item_ids = items['item_id'].astype(str).unique()
-            for item_id in item_ids:
-                embedding = self.model.get_item_embedding(item_id)
-                if embedding is not None:
-                    feature_store.set_item_embedding(item_id, embedding.astype(np.float32))
+            item_ids = _str_ids(pd.unique(items['item_id'].to_numpy()))
+            item_embeddings = self.model.get_item_embeddings(item_ids).astype(np.float32, copy=False)
+            feature_store.set_embeddings_bulk(list(zip(item_ids, item_embeddings)), entity="item")
             
-            # Store interaction counts
-            for _, row in interactions.iterrows():
-                user_id = str(row['user_id'])
-                item_id = str(row['item_id'])
-                
-                # Infer interaction type from rating
-                if 'rating' in row:
-                    rating = row['rating']
-                    if rating >= 4:
-                        feature_store.increment_user_interaction(
-                            user_id, 'click', item_id, value=rating
-                        )
-                        feature_store.increment_item_popularity(item_id, value=rating)
+            # Store interaction counts (ratings >= 4 count as clicks),
+            # filtered once and written through batched pipelines
+            if 'rating' in interactions.columns:
+                ratings = interactions['rating'].to_numpy(dtype=np.float32)
+                mask = ratings >= 4.0
+                feature_store.increment_interactions_bulk(
+                    _str_ids(interactions['user_id'].to_numpy()[mask]).tolist(),
+                    _str_ids(interactions['item_id'].to_numpy()[mask]).tolist(),
+                    ratings[mask].tolist(),
+                    interaction_type='click',
+                )
             
             logger.info("✅ Redis population complete")
             self.feature_store = feature_store
@@ -340,19 +482,29 @@ class RecommenderTrainingPipeline:
         except Exception as e:
             logger.warning(f"Failed to populate Redis: {e}")
     
-    def save_artifacts(self):
-        """Save model artifacts to disk."""
+    def save_artifacts(self) -> List[Path]:
+        """
+        Save model artifacts to disk.
+        
+        Returns:
+            Paths of the files written
+        """
         logger.info("Saving model artifacts...")
         
         # Save embedding model
         model_path = self.model_dir / "embedding_model.pkl"
         self.model.save(str(model_path))
         
-        # Save vector store
+        # Save vector store (.faiss index + .meta id map)
         vector_store_path = self.model_dir / "vector_store"
         self.vector_store.save(str(vector_store_path))
         
         logger.info(f"Artifacts saved to {self.model_dir}")
+        return [
+            model_path,
+            vector_store_path.with_suffix('.faiss'),
+            vector_store_path.with_suffix('.meta'),
+        ]
     
     def log_to_mlflow(self, metrics: Dict[str, float]):
         """
@@ -389,9 +541,10 @@ class RecommenderTrainingPipeline:
                     'item_emb_norm_mean': model_stats['item_embedding_norm_mean'],
                 })
                 
-                # Save and log artifacts
-                self.save_artifacts()
-                mlflow.log_artifacts(str(self.model_dir))
+                # Save and log artifacts (only the files this run wrote,
+                # not everything else that accumulated in model_dir)
+                for artifact_path in self.save_artifacts():
+                    mlflow.log_artifact(str(artifact_path))
                 
                 # Register model
                 mlflow.pyfunc.log_model(
@@ -417,9 +570,8 @@ class RecommenderTrainingPipeline:
         # 1. Load data
         interactions, users, items = self.load_data()
         
-        # 2. Split data
-        train_data = pd.read_csv(self.data_dir / "train.csv")
-        test_data = pd.read_csv(self.data_dir / "test.csv")
+        # 2. Split data (in memory; same temporal split as train.csv/test.csv)
+        train_data, test_data = _temporal_split(interactions)
         
         logger.info(f"Train: {len(train_data)}, Test: {len(test_data)}")
         